@@ -0,0 +1,264 @@
+"""Benchmarks for the client's hot paths against an in-process fake Consul.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.1
+
+Every scenario runs for each installed engine (aiohttp, httpx) and event
+loop (asyncio, uvloop). With ``--baseline`` the run exits with status 1 if
+any scenario lost more than ``--threshold`` of its baseline throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import sys
+import time
+from contextlib import suppress
+
+from discovery import __version__
+from discovery.balancer import RoundRobin
+from discovery.client import Consul
+from discovery.engine import AioEngine, aiohttp_session, httpx_client
+from discovery.engine.aio import has_aiohttp, has_httpx
+from discovery.testing import FakeConsul
+from discovery.utils import select_one_rr
+
+has_uvloop = False
+
+with suppress(ImportError):
+    import uvloop
+
+    has_uvloop = True
+
+SESSIONS = {"aiohttp": aiohttp_session, "httpx": httpx_client}
+RR_SIZES = (10, 1_000, 100_000)
+MIN_ROUNDS = 300
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile, the median of two samples is the lower one."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(len(ordered) * q) - 1)]
+
+
+def summarize(name, latencies, elapsed, errors=0, **labels):
+    ordered = sorted(latencies)
+    return dict(
+        benchmark=name,
+        **labels,
+        iterations=len(ordered),
+        errors=errors,
+        ops_per_sec=round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        p50_ms=round(percentile(ordered, 0.5) * 1000, 4),
+        p99_ms=round(percentile(ordered, 0.99) * 1000, 4),
+        mean_ms=round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+    )
+
+
+async def measure(name, op, iterations, concurrency, **labels):
+    latencies, errors = [], 0
+    remaining = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for n in remaining:
+            start = time.perf_counter()
+            try:
+                await op(n)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(name, latencies, time.perf_counter() - start, errors, **labels)
+
+
+async def client_benchmarks(engine_name, loop_name, iterations, concurrency):
+    labels = dict(engine=engine_name, loop=loop_name)
+    async with FakeConsul() as server:
+        for n in range(10):
+            server.state.register(
+                {
+                    "Node": f"node-{n}",
+                    "Address": f"10.1.0.{n}",
+                    "Service": {"ID": f"web-{n}", "Service": "web", "Port": 8080},
+                }
+            )
+        session = await SESSIONS[engine_name]()
+        client = Consul(AioEngine(session, host=server.host, port=server.port))
+        try:
+            results = [
+                await measure(
+                    "find_service",
+                    lambda n: client.find_service("web"),
+                    iterations,
+                    concurrency,
+                    **labels,
+                ),
+                await measure(
+                    "kv_write",
+                    lambda n: client.kv.update(f"bench/{n % 100}", b"value"),
+                    iterations,
+                    concurrency,
+                    **labels,
+                ),
+                await measure(
+                    "kv_read",
+                    lambda n: client.kv.read(f"bench/{n % 100}"),
+                    iterations,
+                    concurrency,
+                    **labels,
+                ),
+            ]
+
+            async def register(n):
+                await client.register(f"bench-{n}", 8080, dump_service=False)
+                await client.deregister()
+
+            results.append(
+                await measure(
+                    "register_deregister",
+                    register,
+                    max(1, iterations // 10),
+                    1,
+                    **labels,
+                )
+            )
+        finally:
+            await client.client.close()
+    return results
+
+
+def select_one_rr_benchmarks(iterations):
+    results = []
+    for size in RR_SIZES:
+        services = [{"ServiceID": f"web-{n}", "Node": f"node-{n}"} for n in range(size)]
+        rounds = max(MIN_ROUNDS, iterations // max(1, size // 100))
+        balancer = RoundRobin()
+        for name, pick in (
+            ("select_one_rr", select_one_rr),
+            ("round_robin", lambda services: balancer.pick("web", services)),
+        ):
+            # builds the membership (O(n)) once, picks are then O(1)
+            pick(services)
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(rounds):
+                begin = time.perf_counter()
+                pick(services)
+                latencies.append(time.perf_counter() - begin)
+            elapsed = time.perf_counter() - start
+            results.append(summarize(name, latencies, elapsed, instances=size))
+    return results
+
+
+def run_loop(loop_name, coro):
+    if loop_name == "uvloop":
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def engines():
+    return [
+        name
+        for name, available in (("aiohttp", has_aiohttp), ("httpx", has_httpx))
+        if available
+    ]
+
+
+def loops():
+    return ["asyncio", "uvloop"] if has_uvloop else ["asyncio"]
+
+
+def run(iterations=2000, concurrency=10):
+    results = select_one_rr_benchmarks(iterations)
+    for loop_name in loops():
+        for engine_name in engines():
+            results.extend(
+                run_loop(
+                    loop_name,
+                    client_benchmarks(engine_name, loop_name, iterations, concurrency),
+                )
+            )
+    return dict(
+        meta=dict(
+            version=__version__,
+            python=platform.python_version(),
+            platform=platform.platform(),
+            timestamp=int(time.time()),
+            iterations=iterations,
+            concurrency=concurrency,
+        ),
+        results=results,
+    )
+
+
+def _key(result):
+    return tuple(
+        (k, v)
+        for k, v in sorted(result.items())
+        if k in ("benchmark", "engine", "loop", "instances")
+    )
+
+
+def regressions(current, baseline, threshold):
+    """Scenarios whose throughput dropped by more than ``threshold``."""
+    previous = {_key(r): r for r in baseline["results"]}
+    failed = []
+    for result in current["results"]:
+        before = previous.get(_key(result))
+        if not before or not before["ops_per_sec"]:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        if change < -threshold:
+            failed.append(dict(result, change=round(change, 4)))
+    return failed
+
+
+def report(results, stream=sys.stdout):
+    for result in results["results"]:
+        label = "/".join(
+            str(result[k]) for k in ("engine", "loop", "instances") if k in result
+        )
+        stream.write(
+            f"{result['benchmark']:<22}{label:<18}"
+            f"{result['ops_per_sec']:>12.1f} ops/s"
+            f"{result['p50_ms']:>10.3f} p50 ms{result['p99_ms']:>10.3f} p99 ms\n"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations, args.concurrency)
+    report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failed = regressions(results, json.load(f), args.threshold)
+        for result in failed:
+            sys.stderr.write(f"regression: {result}\n")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+import asyncio
+from urllib.parse import urlsplit
+
 import pytest
 
 import aiohttp
@@ -58,6 +61,101 @@ class ApiMock:
         return ResponseMock(expected=self.expected)
 
 
+class RawResponseMock:
+    def __init__(self, url="", status=200, body=b"true", headers=None):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.headers = dict(headers or {})
+        self.reads = 0
+        self.released = False
+
+    async def read(self):
+        self.reads += 1
+        return self.body
+
+    def get_encoding(self):
+        return "utf-8"
+
+    def release(self):
+        self.released = True
+
+
+class HttpxResponseMock:
+    encoding = "utf-8"
+
+    def __init__(self, url="", status=200, body=b"true", headers=None):
+        self.url = url
+        self.status_code = status
+        self.content = body
+        self.headers = dict(headers or {})
+        self.closed = False
+
+    async def aread(self):
+        return self.content
+
+    async def aiter_bytes(self):
+        yield self.content
+
+    async def aclose(self):
+        self.closed = True
+
+
+class SessionMock:
+    """aiohttp-like session answering with :class:`RawResponseMock`.
+
+    ``outcomes`` are consumed one per request, either a status or an
+    exception to raise, then every request answers ``status``. Hosts in
+    ``down`` raise ``error``, ``delays`` holds per host response times and
+    ``bodies`` per ``/v1`` path bodies. ``response`` builds the raw
+    responses, e.g. :class:`HttpxResponseMock` to mimic httpx.
+    """
+
+    def __init__(
+        self,
+        outcomes=(),
+        status=200,
+        body=b"true",
+        bodies=None,
+        headers=None,
+        delay=0,
+        delays=None,
+        down=(),
+        error=ConnectionRefusedError,
+        response=RawResponseMock,
+    ):
+        self.outcomes = list(outcomes)
+        self.status = status
+        self.body = body
+        self.bodies = bodies or {}
+        self.headers = headers
+        self.delay = delay
+        self.delays = delays or {}
+        self.down = set(down)
+        self.error = error
+        self.response = response
+        self.calls = []
+        self.urls = []
+        self.responses = []
+
+    async def request(self, method, url, **kwargs):
+        self.calls.append(kwargs)
+        self.urls.append(url)
+        parts = urlsplit(url)
+        if any(host in parts.netloc for host in self.down):
+            raise self.error(url)
+        delay = self.delays.get(parts.netloc, self.delay)
+        if delay:
+            await asyncio.sleep(delay)
+        outcome = self.outcomes.pop(0) if self.outcomes else self.status
+        if isinstance(outcome, BaseException):
+            raise outcome
+        body = self.bodies.get(parts.path.split("/v1", 1)[-1], self.body)
+        response = self.response(url, outcome, body, self.headers)
+        self.responses.append(response)
+        return response
+
+
 @pytest.fixture
 def consul_api(expected=None):
     return ApiMock(expected=expected)
@@ -2,11 +2,12 @@ from cleo import Application
 from dotenv import load_dotenv
 
 from discovery import __version__
-from discovery.cli.commands import CatalogCommand
+from discovery.cli.commands import BenchCommand, CatalogCommand
 
 load_dotenv()
 
 application = Application("discovery-client", f"{__version__}")
+application.add(BenchCommand())
 application.add(CatalogCommand())
 
 
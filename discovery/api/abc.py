@@ -1,6 +1,47 @@
 import abc
 
 from discovery.engine.abc import Engine
+from discovery.engine.watch import Watch
+
+
+def shared_api(client, name: str):
+    """Return the ``discovery.api.<name>`` instance shared by ``client``'s users.
+
+    Instances are kept on the engine itself so they live exactly as long as
+    it does.
+    """
+    from discovery import api
+
+    try:
+        apis = vars(client).setdefault("_shared_apis", {})
+    except TypeError:
+        return getattr(api, name)(client=client)
+    instance = apis.get(name)
+    if instance is None:
+        instance = apis[name] = getattr(api, name)(client=client)
+    return instance
+
+
+class LazyApi:
+    """Sub-API built on first access and shared between parents of an engine.
+
+    Assigning the attribute (e.g. to inject a custom implementation) takes
+    precedence over the shared instance.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.attr = None
+
+    def __set_name__(self, owner, attr):
+        self.attr = attr
+
+    def __get__(self, parent, owner=None):
+        if parent is None:
+            return self
+        instance = shared_api(parent.client, self.name)
+        parent.__dict__[self.attr] = instance
+        return instance
 
 
 class Api(abc.ABC):
@@ -22,3 +63,10 @@ class Api(abc.ABC):
     @property
     def url(self) -> str:
         return f"{self._client.url}/{self.version}{self.endpoint}"
+
+    def _watch(self, fn, *args, **kwargs) -> Watch:
+        kwargs.setdefault(
+            "instrumentation", getattr(self._client, "instrumentation", None)
+        )
+        kwargs.setdefault("timeout", getattr(self._client, "timeout", None))
+        return Watch(fn, *args, **kwargs)
@@ -1,5 +1,6 @@
-from discovery import api, logging
-from discovery.api.abc import Api
+from discovery import logging
+from discovery.api.abc import Api, LazyApi
+from discovery.api.route import Route
 
 
 class Acl(Api):
@@ -14,19 +15,26 @@ class Acl(Api):
         **kwargs,
     ):
         super().__init__(endpoint=endpoint, **kwargs)
-        self.auth_method = auth_method or api.AuthMethod(client=self.client)
-        self.binding_rule = binding_rule or api.BindingRule(client=self.client)
-        self.policy = policy or api.Policy(client=self.client)
-        self.role = role or api.Role(client=self.client)
-        self.token = token or api.Token(client=self.client)
+        if auth_method is not None:
+            self.auth_method = auth_method
+        if binding_rule is not None:
+            self.binding_rule = binding_rule
+        if policy is not None:
+            self.policy = policy
+        if role is not None:
+            self.role = role
+        if token is not None:
+            self.token = token
 
-    async def bootstrap(self):
-        response = await self.client.put(f"{self.url}/bootstrap")
-        return response
+    auth_method = LazyApi("AuthMethod")
+    binding_rule = LazyApi("BindingRule")
+    policy = LazyApi("Policy")
+    role = LazyApi("Role")
+    token = LazyApi("Token")
 
-    async def replication(self, **kwargs):
-        response = await self.client.get(f"{self.url}/replication", **kwargs)
-        return response
+    bootstrap = Route("PUT", "/bootstrap")
+    replication = Route("GET", "/replication")
+    _translate = Route("POST", "/rules/translate", data="data")
 
     async def translate(self, data, **kwargs):
         logging.warning(
@@ -35,7 +43,5 @@ class Acl(Api):
             "It will be removed in a future major Consul "
             "version when support for legacy ACLs is removed."
         )
-        response = await self.client.post(
-            f"{self.url}/rules/translate", data=data, **kwargs
-        )
+        response = await self._translate(data, **kwargs)
         return response
@@ -1,7 +1,9 @@
-from urllib.parse import quote_plus
+import asyncio
+from typing import Optional
 
-from discovery import api
-from discovery.api.abc import Api
+from discovery.api.abc import Api, LazyApi
+from discovery.api.route import Route
+from discovery.exceptions import ClientOperationException
 
 
 class Agent(Api):
@@ -14,60 +16,63 @@ class Agent(Api):
         **kwargs,
     ):
         super().__init__(endpoint=endpoint, **kwargs)
-        self.checks = checks or api.Checks(client=self.client)
-        self.connect = connect or api.Connect(
-            api.CA(client=self.client),
-            api.Intentions(client=self.client),
-            client=self.client,
-        )
-        self.service = service or api.Service(client=self.client)
-
-    async def members(self, **kwargs):
-        response = await self.client.get(f"{self.url}/members", **kwargs)
-        return response
+        if checks is not None:
+            self.checks = checks
+        if connect is not None:
+            self.connect = connect
+        if service is not None:
+            self.service = service
 
-    async def read_configuration(self, **kwargs):
-        response = await self.client.get(f"{self.url}/self", **kwargs)
-        return response
+    checks = LazyApi("Checks")
+    connect = LazyApi("Connect")
+    service = LazyApi("Service")
 
-    async def reload(self, **kwargs):
-        response = await self.client.put(f"{self.url}/reload", **kwargs)
-        return response
+    members = Route("GET", "/members")
+    read_configuration = Route("GET", "/self")
+    reload = Route("PUT", "/reload")
+    _maintenance = Route("PUT", "/maintenance", params=("enable", "reason"))
+    metrics = Route("GET", "/metrics")
+    join = Route("PUT", "/join/{address}")
+    leave = Route("PUT", "/leave")
+    force_leave = Route("PUT", "/force-leave/{node}")
+    _update_acl_token = Route("PUT", "/token/{token_type}")
 
     async def maintenance(self, enable=True, reason=None, **kwargs):
-        reason = reason or ""
-        response = await self.client.put(
-            f"{self.url}/maintenance?enable={enable}&reason={quote_plus(reason)}",
-            **kwargs,
+        response = await self._maintenance(
+            enable=bool(enable), reason=reason or "", **kwargs
         )
         return response
 
-    async def metrics(self, **kwargs):
-        response = await self.client.get(f"{self.url}/metrics", **kwargs)
-        return response
-
-    async def stream_logs(self, chunk_size=20, **kwargs):
-        async with self.client.session.get(f"{self.url}/monitor", **kwargs) as resp:
-            with open("/tmp/teste", "wb") as fd:
-                while True:
-                    chunk = await resp.content.read(chunk_size)
-                    if not chunk:
-                        break
-                    fd.write(chunk)
-        # response = await self.client.get(f"{self.url}/monitor", **kwargs)
-        # return response
-
-    async def join(self, address, **kwargs):
-        response = await self.client.put(f"{self.url}/join/{address}", **kwargs)
-        return response
-
-    async def leave(self, **kwargs):
-        response = await self.client.put(f"{self.url}/leave", **kwargs)
-        return response
-
-    async def force_leave(self, node, **kwargs):
-        response = await self.client.put(f"{self.url}/force-leave/{node}", **kwargs)
-        return response
+    async def stream_logs(
+        self,
+        loglevel: Optional[str] = None,
+        logjson: bool = False,
+        chunk_size: int = 1 << 14,
+        queue_size: int = 0,
+        **kwargs,
+    ):
+        params = dict(kwargs.pop("params", None) or {})
+        if loglevel:
+            params["loglevel"] = loglevel
+        if logjson:
+            params["logjson"] = "true"
+        response = await self.client.get(
+            f"{self.url}/monitor", params=params, stream=True, **kwargs
+        )
+        if response.status != 200:
+            await response.close()
+            raise ClientOperationException(
+                f"monitor failed with status {response.status}"
+            )
+        lines = _log_lines(response, chunk_size)
+        if queue_size > 0:
+            lines = _buffered(lines, queue_size)
+        try:
+            async for line in lines:
+                yield line
+        finally:
+            await lines.aclose()
+            await response.close()
 
     async def update_acl_token(self, token_type: str):
         if token_type not in [
@@ -84,5 +89,43 @@ class Agent(Api):
                 "token_type invalid. See the valid values in: "
                 "https://www.consul.io/api/agent.html#update-acl-tokens"
             )
-        response = await self.client.put(f"{self.url}/token/{token_type}")
+        response = await self._update_acl_token(token_type)
         return response
+
+
+async def _log_lines(response, chunk_size):
+    pending = b""
+    async for chunk in response.iter_chunks(chunk_size):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+async def _buffered(lines, queue_size):
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    done = object()
+
+    async def produce():
+        try:
+            async for line in lines:
+                await queue.put(line)
+        except Exception as err:
+            await queue.put(err)
+        else:
+            await queue.put(done)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            line = await queue.get()
+            if line is done:
+                break
+            if isinstance(line, Exception):
+                raise line
+            yield line
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        await lines.aclose()
@@ -1,26 +1,17 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class BindingRule(Api):
     def __init__(self, endpoint: str = "/acl/binding-rule", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def create(self, data, **kwargs):
-        response = await self.client.put(f"{self.url}", data=data, **kwargs)
-        return response
-
-    async def read(self, role_id, **kwargs):
-        response = await self.client.get(f"{self.url}/{role_id}", **kwargs)
-        return response
+    create = Route("PUT", data="data")
+    read = Route("GET", "/{role_id}")
+    _update = Route("PUT", "/{role_id}", data="data")
+    delete = Route("DELETE", "/{role_id}")
+    list = Route("GET")
 
     async def update(self, data, role_id, **kwargs):
-        response = await self.client.put(f"{self.url}/{role_id}", data=data, **kwargs)
-        return response
-
-    async def delete(self, role_id, **kwargs):
-        response = await self.client.delete(f"{self.url}/{role_id}", **kwargs)
-        return response
-
-    async def list(self, **kwargs):
-        response = await self.client.get(f"{self.url}", **kwargs)
+        response = await self._update(role_id, data, **kwargs)
         return response
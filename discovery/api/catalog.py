@@ -1,38 +1,25 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Catalog(Api):
     def __init__(self, endpoint: str = "/catalog", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def register(self, data: dict, **kwargs):
-        response = await self.client.put(f"{self.url}/register", data=data, **kwargs)
-        return response
+    register = Route("PUT", "/register", data="data")
+    deregister = Route("PUT", "/deregister", data="data")
+    datacenters = Route("GET", "/datacenters")
+    nodes = Route("GET", "/nodes")
+    services = Route("GET", "/services")
+    service = Route("GET", "/service/{name}")
+    connect = Route("GET", "/connect/{service}")
+    node = Route("GET", "/node/{node}")
 
-    async def deregister(self, data, **kwargs):
-        response = await self.client.put(f"{self.url}/deregister", **kwargs, data=data)
-        return response
+    def watch_nodes(self, **kwargs):
+        return self._watch(self.nodes, **kwargs)
 
-    async def datacenters(self, **kwargs):
-        response = await self.client.get(f"{self.url}/datacenters", **kwargs)
-        return response
+    def watch_services(self, **kwargs):
+        return self._watch(self.services, **kwargs)
 
-    async def nodes(self, **kwargs):
-        response = await self.client.get(f"{self.url}/nodes", **kwargs)
-        return response
-
-    async def services(self, **kwargs):
-        response = await self.client.get(f"{self.url}/services", **kwargs)
-        return response
-
-    async def service(self, name, **kwargs):
-        response = await self.client.get(f"{self.url}/service/{name}", **kwargs)
-        return response
-
-    async def connect(self, service, **kwargs):
-        response = await self.client.get(f"{self.url}/connect/{service}", **kwargs)
-        return response
-
-    async def node(self, node, **kwargs):
-        response = await self.client.get(f"{self.url}/node/{node}", **kwargs)
-        return response
+    def watch_service(self, name, **kwargs):
+        return self._watch(self.service, name, **kwargs)
@@ -1,4 +1,5 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Config(Api):
@@ -13,21 +14,22 @@ class Config(Api):
             )
         return True
 
-    async def apply(self, data, **kwargs):
-        response = await self.client.put(f"{self.url}", data=data, **kwargs)
-        return response
+    apply = Route("PUT", data="data")
+    _get = Route("GET", "/{kind}/{name}")
+    _list = Route("GET", "/{kind}")
+    _delete = Route("DELETE", "/{kind}/{name}")
 
     async def get(self, kind, name, **kwargs):
         if self._config_entry_kind_is_valid(kind):
-            response = await self.client.get(f"{self.url}/{kind}/{name}", **kwargs)
+            response = await self._get(kind, name, **kwargs)
             return response
 
     async def list(self, kind, **kwargs):
         if self._config_entry_kind_is_valid(kind):
-            response = await self.client.get(f"{self.url}/{kind}", **kwargs)
+            response = await self._list(kind, **kwargs)
             return response
 
     async def delete(self, kind, name, **kwargs):
         if self._config_entry_kind_is_valid(kind):
-            response = await self.client.delete(f"{self.url}/{kind}/{name}", **kwargs)
+            response = await self._delete(kind, name, **kwargs)
             return response
@@ -1,7 +1,5 @@
-import json
-
-from discovery import api
-from discovery.api.abc import Api
+from discovery.api.abc import Api, LazyApi
+from discovery.api.route import Route
 
 
 class Connect(Api):
@@ -9,8 +7,17 @@ class Connect(Api):
         self, ca=None, intentions=None, endpoint: str = "/agent/connect", **kwargs
     ):
         super().__init__(endpoint=endpoint, **kwargs)
-        self.ca = ca or api.CA(client=self.client)
-        self.intentions = intentions or api.Intentions(client=self.client)
+        if ca is not None:
+            self.ca = ca
+        if intentions is not None:
+            self.intentions = intentions
+
+    ca = LazyApi("CA")
+    intentions = LazyApi("Intentions")
+
+    _authorize = Route("POST", "/authorize", data="data")
+    ca_roots = Route("GET", "/ca/roots")
+    leaf_certificate = Route("GET", "/ca/leaf/{service}")
 
     async def authorize(
         self, target, client_cert_uri, client_cert_serial, namespace=None
@@ -22,15 +29,5 @@ class Connect(Api):
         )
         if namespace:
             data.update({"Namespace": namespace})
-        response = await self.client.post(
-            f"{self.url}/authorize", data=json.dumps(data)
-        )
-        return response
-
-    async def ca_roots(self):
-        response = await self.client.get(f"{self.url}/ca/roots")
-        return response
-
-    async def leaf_certificate(self, service: str):
-        response = await self.client.get(f"{self.url}/ca/leaf/{service}")
+        response = await self._authorize(data)
         return response
@@ -1,14 +1,14 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Events(Api):
     def __init__(self, endpoint: str = "/event", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def fire(self, name, data, **kwargs):
-        response = await self.client.put(f"{self.url}/fire/{name}", data=data, **kwargs)
-        return response
+    fire = Route("PUT", "/fire/{name}", data="data")
+    _list = Route("GET", "/list", params=("name",))
 
-    async def list(self, key, **kwargs):
-        response = await self.client.get(f"{self.url}/list", **kwargs)
+    async def list(self, key=None, **kwargs):
+        response = await self._list(name=key or None, **kwargs)
         return response
@@ -1,29 +1,32 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Health(Api):
     def __init__(self, endpoint: str = "/health", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def node(self, node, **kwargs):
-        response = await self.client.get(f"{self.url}/node/{node}", **kwargs)
-        return response
-
-    async def checks(self, service, **kwargs):
-        response = await self.client.get(f"{self.url}/checks/{service}", **kwargs)
-        return response
-
-    async def service(self, service, **kwargs):
-        response = await self.client.get(f"{self.url}/service/{service}", **kwargs)
-        return response
-
-    async def connect(self, service, **kwargs):
-        response = await self.client.get(f"{self.url}/connect/{service}", **kwargs)
-        return response
+    node = Route("GET", "/node/{node}")
+    checks = Route("GET", "/checks/{service}")
+    service = Route("GET", "/service/{service}")
+    connect = Route("GET", "/connect/{service}")
+    _state = Route("GET", "/state/{state}")
 
     async def state(self, state, **kwargs):
         state = str(state).lower()
         if state not in ["passing", "warning", "critical"]:
             raise ValueError('Valid values are "passing", "warning", and "critical"')
-        response = await self.client.get(f"{self.url}/state/{str(state)}", **kwargs)
+        response = await self._state(state, **kwargs)
         return response
+
+    def watch_node(self, node, **kwargs):
+        return self._watch(self.node, node, **kwargs)
+
+    def watch_checks(self, service, **kwargs):
+        return self._watch(self.checks, service, **kwargs)
+
+    def watch_service(self, service, **kwargs):
+        return self._watch(self.service, service, **kwargs)
+
+    def watch_state(self, state, **kwargs):
+        return self._watch(self.state, state, **kwargs)
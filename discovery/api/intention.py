@@ -1,4 +1,5 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Intentions(Api):
@@ -10,35 +11,19 @@ class Intentions(Api):
             raise ValueError('by must be: "source" or "destination"')
         return True
 
-    async def create(self, data, **kwargs):
-        response = await self.client.post(f"{self.url}", data=data, **kwargs)
-        return response
-
-    async def read(self, uuid, **kwargs):
-        response = await self.client.get(f"{self.url}/{uuid}", **kwargs)
-        return response
-
-    async def list(self, **kwargs):
-        response = await self.client.get(f"{self.url}", **kwargs)
-        return response
-
-    async def update(self, uuid, data, **kwargs):
-        response = await self.client.put(f"{self.url}/{uuid}", data=data, **kwargs)
-        return response
-
-    async def delete(self, uuid, **kwargs):
-        response = await self.client.delete(f"{self.url}/{uuid}", **kwargs)
-        return response
+    create = Route("POST", data="data")
+    read = Route("GET", "/{uuid}")
+    list = Route("GET")
+    update = Route("PUT", "/{uuid}", data="data")
+    delete = Route("DELETE", "/{uuid}")
+    _check = Route("GET", "/check", params=("source", "destination"))
+    _match = Route("GET", "/match", params=("by", "name"))
 
     async def check(self, source, destination, **kwargs):
-        response = await self.client.get(
-            f"{self.url}/check?source={source}&destination={destination}", **kwargs
-        )
+        response = await self._check(source=source, destination=destination, **kwargs)
         return response
 
     async def match(self, by, name, **kwargs):
         if self.by_is_valid(by):
-            response = await self.client.get(
-                f"{self.url}/match?by={by}&name={name}", **kwargs
-            )
+            response = await self._match(by=by, name=name, **kwargs)
             return response
@@ -1,22 +1,12 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Keyring(Api):
     def __init__(self, endpoint: str = "/operator/keyring", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def list(self, **kwargs):
-        response = await self.client.get(f"{self.url}", **kwargs)
-        return response
-
-    async def add(self, data, **kwargs):
-        response = await self.client.post(f"{self.url}", data=data, **kwargs)
-        return response
-
-    async def change(self, data, **kwargs):
-        response = await self.client.put(f"{self.url}", data=data, **kwargs)
-        return response
-
-    async def delete(self, data, **kwargs):
-        response = await self.client.delete(f"{self.url}", data=data, **kwargs)
-        return response
+    list = Route("GET")
+    add = Route("POST", data="data")
+    change = Route("PUT", data="data")
+    delete = Route("DELETE", data="data")
@@ -1,18 +1,11 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class License(Api):
     def __init__(self, endpoint: str = "/operator/license", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def current(self, **kwargs):
-        resp = await self.client.get(f"{self.url}", **kwargs)
-        return resp
-
-    async def update(self, data, **kwargs):
-        resp = await self.client.put(f"{self.url}", data=data, **kwargs)
-        return resp
-
-    async def reset(self, **kwargs):
-        response = await self.client.delete(f"{self.url}", **kwargs)
-        return response
+    current = Route("GET")
+    update = Route("PUT", data="data")
+    reset = Route("DELETE")
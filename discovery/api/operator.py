@@ -1,5 +1,4 @@
-from discovery import api
-from discovery.api.abc import Api
+from discovery.api.abc import Api, LazyApi
 
 
 class Operator(Api):
@@ -15,9 +14,22 @@ class Operator(Api):
         **kwargs
     ):
         super().__init__(endpoint=endpoint, **kwargs)
-        self.area = area or api.Area(client=self.client)
-        self.autopilot = autopilot or api.AutoPilot(client=self.client)
-        self.keyring = keyring or api.Keyring(client=self.client)
-        self.license = license or api.License(client=self.client)
-        self.raft = raft or api.Raft(client=self.client)
-        self.segment = segment or api.Segment(client=self.client)
+        if area is not None:
+            self.area = area
+        if autopilot is not None:
+            self.autopilot = autopilot
+        if keyring is not None:
+            self.keyring = keyring
+        if license is not None:
+            self.license = license
+        if raft is not None:
+            self.raft = raft
+        if segment is not None:
+            self.segment = segment
+
+    area = LazyApi("Area")
+    autopilot = LazyApi("AutoPilot")
+    keyring = LazyApi("Keyring")
+    license = LazyApi("License")
+    raft = LazyApi("Raft")
+    segment = LazyApi("Segment")
@@ -1,14 +1,10 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Raft(Api):
     def __init__(self, endpoint: str = "/operator/raft", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def read_configuration(self, **kwargs):
-        response = await self.client.get(f"{self.url}/configuration", **kwargs)
-        return response
-
-    async def delete_peer(self, **kwargs):
-        response = await self.client.delete(f"{self.url}/peer", **kwargs)
-        return response
+    read_configuration = Route("GET", "/configuration")
+    delete_peer = Route("DELETE", "/peer")
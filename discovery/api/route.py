@@ -0,0 +1,128 @@
+from string import Formatter
+from typing import Optional
+
+from discovery.metrics import current_route
+
+
+def encode_param(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+class Route:
+    """Declare the HTTP method, path template and query params of an Api call.
+
+    Routes are compiled on first access into a :class:`BoundRoute` cached on
+    the Api instance, so the URL prefix is built once per client instead of
+    on every call. Path fields and the optional ``data`` argument can be
+    passed positionally or by name; ``params`` are taken from keyword
+    arguments and merged into the query string. ``name`` overrides the
+    metrics label, derived from the endpoint and attribute by default.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "params",
+        "data",
+        "endpoint",
+        "name",
+        "fields",
+        "template",
+        "attr",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        path: str = "",
+        params=(),
+        data: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        name: Optional[str] = None,
+    ):
+        self.method = method
+        self.path = path
+        self.params = tuple(params)
+        self.data = data
+        self.endpoint = endpoint
+        self.name = name
+        parsed = list(Formatter().parse(path))
+        self.fields = tuple(field for _, field, _, _ in parsed if field)
+        self.template = "".join(
+            literal.replace("{", "{{").replace("}", "}}") + ("{}" if field else "")
+            for literal, field, _, _ in parsed
+        )
+        self.attr = ""
+
+    def __set_name__(self, owner, name):
+        self.attr = name
+
+    def __get__(self, api, owner=None):
+        if api is None:
+            return self
+        bound = BoundRoute(self, api)
+        api.__dict__[self.attr] = bound
+        return bound
+
+
+class BoundRoute:
+    __slots__ = ("route", "name", "prefix", "url", "_client", "_send")
+
+    def __init__(self, route: Route, api):
+        endpoint = route.endpoint or api.endpoint
+        self.route = route
+        self.name = (
+            route.name
+            or f"{endpoint.strip('/').replace('/', '.')}.{route.attr.strip('_')}"
+        )
+        self.prefix = f"{api.client.url}/{api.version}{endpoint}"
+        self.url = None if route.fields else f"{self.prefix}{route.path}"
+        self._client = api.client
+        self._send = getattr(api.client, route.method.lower())
+
+    def __repr__(self) -> str:
+        return f"Route({self.route.method} {self.prefix}{self.route.path})"
+
+    def _build(self, args, kwargs):
+        route = self.route
+        fields = route.fields
+        if not fields:
+            url = self.url
+        elif len(args) >= len(fields):
+            url = self.prefix + route.template.format(*args[: len(fields)])
+            args = args[len(fields) :]
+        else:
+            missing = fields[len(args) :]
+            try:
+                values = args + tuple(kwargs.pop(field) for field in missing)
+            except KeyError as err:
+                raise TypeError(f"{self.name}() missing argument {err}") from None
+            url = self.prefix + route.template.format(*values)
+            args = ()
+        if args:
+            if route.data is None or len(args) > 1:
+                raise TypeError(f"{self.name}() got too many positional arguments")
+            kwargs["data"] = args[0]
+        elif route.data is not None and route.data != "data" and route.data in kwargs:
+            kwargs["data"] = kwargs.pop(route.data)
+        if route.params:
+            params = dict(kwargs.pop("params", None) or {})
+            for name in route.params:
+                value = kwargs.pop(name, None)
+                if value is not None:
+                    params[name] = encode_param(value)
+            if params:
+                kwargs["params"] = params
+        return url
+
+    async def __call__(self, *args, **kwargs):
+        url = self._build(args, kwargs)
+        if getattr(self._client, "instrumentation", None) is None:
+            return await self._send(url, **kwargs)
+        token = current_route.set(self.name)
+        try:
+            return await self._send(url, **kwargs)
+        finally:
+            current_route.reset(token)
@@ -1,10 +1,9 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Segment(Api):
     def __init__(self, endpoint: str = "/operator/segment", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def list(self, **kwargs):
-        response = await self.client.get(f"{self.url}", **kwargs)
-        return response
+    list = Route("GET")
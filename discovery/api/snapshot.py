@@ -1,14 +1,91 @@
+import mmap
+import os
+from typing import Optional
+
 from discovery.api.abc import Api
+from discovery.api.route import Route
+from discovery.exceptions import ClientOperationException
 
 
 class Snapshot(Api):
     def __init__(self, endpoint: str = "/snapshot", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def generate(self, **kwargs):
-        response = await self.client.get(f"{self.url}", **kwargs)
-        return response
+    generate = Route("GET")
+    restore = Route("PUT", data="data")
+
+    async def save_to(self, path, chunk_size: int = 1 << 20, **kwargs) -> int:
+        response = await self.generate(stream=True, **kwargs)
+        partial = f"{path}.part"
+        size = 0
+        try:
+            if response.status != 200:
+                raise ClientOperationException(
+                    f"snapshot failed with status {response.status}"
+                )
+            with open(partial, "wb") as f:
+                async for chunk in response.iter_chunks(chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(partial, path)
+        finally:
+            await response.close()
+            if os.path.exists(partial):
+                os.unlink(partial)
+        return size
+
+    async def restore_from(
+        self,
+        path,
+        chunk_size: int = 1 << 20,
+        progress=None,
+        expected_size: Optional[int] = None,
+        use_mmap: bool = False,
+        **kwargs,
+    ):
+        size = os.path.getsize(path)
+        if size == 0 or (expected_size is not None and size != expected_size):
+            raise ClientOperationException(
+                f"snapshot {path} has {size} bytes, expected {expected_size}"
+            )
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["Content-Length"] = str(size)
+        if not use_mmap:
+            data = self._read_chunks(path, size, chunk_size, progress)
+            return await self.restore(data, headers=headers, **kwargs)
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                view = memoryview(buffer)
+                try:
+                    data = self._view_chunks(view, chunk_size, progress)
+                    return await self.restore(data, headers=headers, **kwargs)
+                finally:
+                    view.release()
+
+    async def _view_chunks(self, view, chunk_size, progress):
+        # zero-copy slices, streamed since httpx rejects a bare buffer
+        size = len(view)
+        for start in range(0, size, chunk_size):
+            yield view[start : start + chunk_size]
+            if progress is not None:
+                progress(min(size, start + chunk_size), size)
 
-    async def restore(self, data, **kwargs):
-        response = await self.client.put(f"{self.url}", data=data, **kwargs)
-        return response
+    async def _read_chunks(self, path, size, chunk_size, progress):
+        sent = 0
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                if sent > size:
+                    break
+                yield chunk
+                if progress is not None:
+                    progress(sent, size)
+        if sent != size:
+            raise ClientOperationException(
+                f"snapshot {path} changed while streaming ({sent} != {size} bytes)"
+            )
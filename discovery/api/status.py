@@ -1,14 +1,10 @@
 from discovery.api.abc import Api
+from discovery.api.route import Route
 
 
 class Status(Api):
     def __init__(self, endpoint: str = "/status", **kwargs):
         super().__init__(endpoint=endpoint, **kwargs)
 
-    async def leader(self, **kwargs):
-        response = await self.client.get(f"{self.url}/leader", **kwargs)
-        return response
-
-    async def peers(self, **kwargs):
-        response = await self.client.get(f"{self.url}/peers", **kwargs)
-        return response
+    leader = Route("GET", "/leader")
+    peers = Route("GET", "/peers")
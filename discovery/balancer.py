@@ -0,0 +1,549 @@
+import hashlib
+import heapq
+import random
+import socket
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from discovery.utils import instance_id
+
+MAX_SCHEDULE = 10000
+REPICKS = 2
+
+
+class InstanceStats:
+    __slots__ = (
+        "outstanding",
+        "latency",
+        "requests",
+        "errors",
+        "failures",
+        "slow",
+        "ejections",
+        "ejected_until",
+    )
+
+    def __init__(self) -> None:
+        self.outstanding = 0
+        self.latency = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0
+        self.slow = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"InstanceStats(outstanding={self.outstanding}, "
+            f"latency={self.latency:.4f}, requests={self.requests}, "
+            f"errors={self.errors}, ejected={self.ejected_until > 0})"
+        )
+
+    def finish(self, latency: Optional[float] = None, error: bool = False, alpha=0.3):
+        self.outstanding = max(0, self.outstanding - 1)
+        self.requests += 1
+        if error:
+            self.errors += 1
+        if latency is not None:
+            if self.latency:
+                latency = alpha * latency + (1 - alpha) * self.latency
+            self.latency = latency
+
+    def eject(self, now: float, base: float, maximum: float) -> None:
+        self.ejections += 1
+        self.ejected_until = now + min(maximum, base * 2 ** (self.ejections - 1))
+        self.failures = 0
+        self.slow = 0
+
+
+class Membership:
+    """Instances currently known for a service and the balancer's state."""
+
+    def __init__(self, instances, ids, previous: Optional["Membership"] = None) -> None:
+        self.source = instances
+        self.instances = list(instances)
+        self.ids = ids
+        self.index = {id_: position for position, id_ in enumerate(ids)}
+        if previous is None:
+            self.stats = [InstanceStats() for _ in ids]
+        else:
+            self.stats = [
+                (
+                    previous.stats[previous.index[id_]]
+                    if id_ in previous.index
+                    else InstanceStats()
+                )
+                for id_ in ids
+            ]
+        self.ejected = sum(1 for stats in self.stats if stats.ejected_until)
+        self.latency: float = previous.latency if previous is not None else 0.0
+        self.samples: int = previous.samples if previous is not None else 0
+        self.position = 0
+        self.used = 0.0
+
+
+class OutlierDetector:
+    """Passively eject instances failing or slowing down between health checks.
+
+    An instance is ejected after ``consecutive_errors`` errors in a row, or
+    ``consecutive_slow`` requests slower than ``latency_factor`` times the
+    service's EWMA latency; spikes move that baseline by a bounded amount so a
+    single outlier cannot mask itself. Ejections last ``ejection_time``,
+    doubling on each repeated ejection up to ``max_ejection_time``, and never
+    cover more than ``max_ejection_percent`` (0-100, like Envoy) of a
+    service's instances, at least one unless it is 0. Ejected instances are
+    returned to rotation once their ejection expires.
+    """
+
+    def __init__(
+        self,
+        consecutive_errors: int = 5,
+        consecutive_slow: int = 5,
+        latency_factor: float = 3.0,
+        min_requests: int = 10,
+        ejection_time: float = 30,
+        max_ejection_time: float = 300,
+        max_ejection_percent: float = 10,
+    ):
+        if not 0 <= max_ejection_percent <= 100:
+            raise ValueError(
+                f"max_ejection_percent must be within 0-100, not {max_ejection_percent}"
+            )
+        self.consecutive_errors = consecutive_errors
+        self.consecutive_slow = consecutive_slow
+        self.latency_factor = latency_factor
+        self.min_requests = min_requests
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.max_ejection_percent = max_ejection_percent
+
+    def record(self, state, stats, latency, error, now, alpha=0.3) -> bool:
+        """Update ``stats`` with a request outcome, return True if ejected."""
+        if error:
+            stats.failures += 1
+        elif latency is not None:
+            baseline = state.latency
+            slow = (
+                state.samples >= self.min_requests
+                and latency > self.latency_factor * baseline
+            )
+            if baseline:
+                sample = min(latency, self.latency_factor * baseline)
+                state.latency = alpha * sample + (1 - alpha) * baseline
+            else:
+                state.latency = latency
+            state.samples += 1
+            if slow:
+                stats.slow += 1
+            else:
+                stats.failures = 0
+                stats.slow = 0
+                if not stats.ejected_until:
+                    stats.ejections = 0
+        if (
+            stats.failures < self.consecutive_errors
+            and stats.slow < self.consecutive_slow
+        ) or stats.ejected_until > now:
+            return False
+        if not self.allowed(state, now):
+            return False
+        if not stats.ejected_until:
+            state.ejected += 1
+        stats.eject(now, self.ejection_time, self.max_ejection_time)
+        return True
+
+    def allowed(self, state: Membership, now: float) -> bool:
+        if not self.max_ejection_percent:
+            return False
+        limit = max(1, int(len(state.stats) * self.max_ejection_percent / 100))
+        if state.ejected >= limit:
+            for stats in state.stats:
+                if stats.ejected_until and stats.ejected_until <= now:
+                    stats.ejected_until = 0.0
+                    state.ejected -= 1
+        return state.ejected < limit
+
+
+def instance_weight(instance) -> int:
+    """Consul ``Weights.Passing``, or ``Weights.Warning`` if a check warns."""
+    if not isinstance(instance, dict):
+        return 1
+    service = instance.get("Service")
+    if isinstance(service, dict):
+        weights = service.get("Weights") or {}
+        checks = instance.get("Checks") or []
+        if any(check.get("Status") == "warning" for check in checks):
+            return int(weights.get("Warning", 1))
+        return int(weights.get("Passing", 1))
+    return int((instance.get("ServiceWeights") or {}).get("Passing", 1))
+
+
+def hash_key(value, salt: bytes = b"") -> int:
+    """Process-independent 64 bits hash, shared by every client."""
+    if not isinstance(value, bytes):
+        value = str(value).encode()
+    digest = hashlib.blake2b(value, digest_size=8, salt=salt).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RendezvousSubset:
+    """Deterministic subset of ``size`` instances per client.
+
+    Instances are ranked by a rendezvous hash of ``client_id`` and their id,
+    so a client keeps the same subset across calls and restarts, different
+    clients spread over different subsets, and a membership change only
+    swaps the instances that left or joined the top ``size``. ``client_id``
+    defaults to the hostname, unique per pod.
+    """
+
+    def __init__(self, size: int, client_id: Optional[str] = None):
+        if size < 1:
+            raise ValueError(f"subset size must be at least 1, not {size}")
+        self.size = size
+        self.client_id = client_id or socket.gethostname()
+
+    def __call__(self, instances, ids):
+        if len(ids) <= self.size:
+            return instances, ids
+        chosen = heapq.nlargest(
+            self.size,
+            range(len(ids)),
+            key=lambda position: hash_key(f"{self.client_id}/{ids[position]}"),
+        )
+        chosen.sort()
+        return [instances[p] for p in chosen], [ids[p] for p in chosen]
+
+
+class Balancer:
+    """Per-client instance selector keyed by service name.
+
+    Membership is only recomputed when ``find_services`` hands over a new
+    instance list, so repeated picks from a cached list cost O(1). Services
+    not used for ``ttl`` seconds, or beyond ``maxsize``, are evicted. Picks
+    never await, which makes them atomic with respect to other coroutines.
+
+    Every pick counts as an outstanding request on the chosen instance until
+    it is :meth:`report`-ed back with its latency and outcome. With an
+    ``outlier`` detector, reported failures eject instances from selection.
+    With a ``subset``, balancing only runs over the instances it keeps.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 600,
+        alpha: float = 0.3,
+        outlier: Optional[OutlierDetector] = None,
+        subset: Optional[RendezvousSubset] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.alpha = alpha
+        self.outlier = outlier
+        self.subset = subset
+        self._services: "OrderedDict[str, Membership]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._services)
+
+    def __contains__(self, name):
+        return name in self._services
+
+    def pick(self, name, instances, key=None):
+        if not instances:
+            raise ValueError(f"no instances available for {name}")
+        state = self.members(name, instances)
+        position = self.select(state, key)
+        if state.ejected:
+            position = self.available(state, position, key)
+        state.stats[position].outstanding += 1
+        return state.instances[position]
+
+    def available(self, state: Membership, position: int, key=None) -> int:
+        """Replace an ejected ``position`` by an instance still in rotation.
+
+        The strategy gets a couple more picks before falling back to a scan;
+        when every instance is ejected, ejections are ignored altogether.
+        """
+        now = time.monotonic()
+        for _ in range(REPICKS):
+            if self._usable(state, position, now):
+                return position
+            position = self.select(state, key)
+        size = len(state.stats)
+        for offset in range(size):
+            candidate = (position + offset) % size
+            if self._usable(state, candidate, now):
+                return candidate
+        return position
+
+    def _usable(self, state, position, now) -> bool:
+        stats = state.stats[position]
+        if not stats.ejected_until:
+            return True
+        if stats.ejected_until > now:
+            return False
+        stats.ejected_until = 0.0
+        state.ejected -= 1
+        return True
+
+    def report(
+        self, name, instance, latency: Optional[float] = None, error: bool = False
+    ):
+        """Record the outcome of a request sent to a picked ``instance``."""
+        state = self._services.get(name)
+        if state is None:
+            return
+        position = state.index.get(instance_id(instance))
+        if position is None:
+            return
+        stats = state.stats[position]
+        stats.finish(latency, error, self.alpha)
+        if self.outlier is not None:
+            self.outlier.record(
+                state, stats, latency, error, time.monotonic(), self.alpha
+            )
+
+    def stats(self, name, instance) -> Optional[InstanceStats]:
+        state = self._services.get(name)
+        if state is not None:
+            position = state.index.get(instance_id(instance))
+            if position is not None:
+                return state.stats[position]
+        return None
+
+    def members(self, name, instances) -> Membership:
+        now = time.monotonic()
+        state = self._services.get(name)
+        if state is None or state.source is not instances:
+            state = self._services[name] = self._update(instances, state)
+        self._services.move_to_end(name)
+        state.used = now
+        self._evict(now)
+        return state
+
+    def select(self, state: Membership, key=None) -> int:
+        """Return the position of the instance to use in ``state.instances``."""
+        raise NotImplementedError
+
+    def rebuild(self, state: Membership, previous: Optional[Membership] = None) -> None:
+        """Carry balancing state over from ``previous`` membership."""
+
+    def invalidate(self, name=None) -> None:
+        if name is None:
+            self._services.clear()
+        else:
+            self._services.pop(name, None)
+
+    def _update(self, source, previous):
+        instances = source
+        ids = [instance_id(instance) for instance in instances]
+        if self.subset is not None:
+            instances, ids = self.subset(instances, ids)
+        if previous is not None and previous.ids == ids:
+            previous.source = source
+            previous.instances = list(instances)
+            self.refresh(previous)
+            return previous
+        state = Membership(instances, ids, previous)
+        state.source = source
+        self.rebuild(state, previous)
+        return state
+
+    def refresh(self, state: Membership) -> None:
+        """Instances were updated in place, e.g. their weights or checks."""
+
+    def _evict(self, now):
+        services = self._services
+        while len(services) > self.maxsize:
+            services.popitem(last=False)
+        while services:
+            name, oldest = next(iter(services.items()))
+            if now - oldest.used <= self.ttl:
+                break
+            del services[name]
+
+
+class RoundRobin(Balancer):
+    """Rotate through instances, resuming at the same instance on changes."""
+
+    def select(self, state, key=None):
+        position = state.position % len(state.instances)
+        state.position = position + 1
+        return position
+
+    def rebuild(self, state, previous=None):
+        if previous is None or not previous.ids:
+            return
+        upcoming = previous.ids[previous.position % len(previous.ids)]
+        state.position = state.index.get(upcoming, previous.position)
+
+
+class WeightedRoundRobin(Balancer):
+    """Round-robin honouring Consul ``Weights.Passing``/``Weights.Warning``.
+
+    An interleaved schedule is precomputed on membership changes so picks
+    stay O(1); total weight is scaled down to at most ``MAX_SCHEDULE`` slots.
+    """
+
+    def select(self, state, key=None):
+        schedule = state.schedule
+        position = state.position % len(schedule)
+        state.position = position + 1
+        return schedule[position]
+
+    def rebuild(self, state, previous=None):
+        self.refresh(state)
+
+    def refresh(self, state):
+        weights = [max(0, instance_weight(i)) for i in state.instances]
+        total = sum(weights)
+        if not total:
+            weights, total = [1] * len(weights), len(weights)
+        if total > MAX_SCHEDULE:
+            weights = [w and max(1, w * MAX_SCHEDULE // total) for w in weights]
+        slots = sorted(
+            ((step - 0.5) / weight, position)
+            for position, weight in enumerate(weights)
+            for step in range(1, weight + 1)
+        )
+        state.schedule = [position for _, position in slots]
+
+
+class PowerOfTwoChoices(Balancer):
+    """Pick the less loaded of two random instances by outstanding requests."""
+
+    def select(self, state, key=None):
+        size = len(state.instances)
+        if size == 1:
+            return 0
+        first, second = random.sample(range(size), 2)
+        if self.cost(state.stats[second]) < self.cost(state.stats[first]):
+            return second
+        return first
+
+    def cost(self, stats: InstanceStats) -> float:
+        return stats.outstanding
+
+
+class LeastOutstanding(Balancer):
+    """Pick the instance with the fewest outstanding requests.
+
+    Ties are broken by rotating the scan start so idle instances share load.
+    """
+
+    def select(self, state, key=None):
+        stats = state.stats
+        size = len(stats)
+        start = state.position % size
+        state.position = start + 1
+        best, lowest = start, stats[start].outstanding
+        for offset in range(1, size):
+            position = (start + offset) % size
+            if stats[position].outstanding < lowest:
+                best, lowest = position, stats[position].outstanding
+                if not lowest:
+                    break
+        return best
+
+
+class LatencyEWMA(PowerOfTwoChoices):
+    """Power of two choices on EWMA latency weighted by outstanding requests.
+
+    Instances without measurements cost nothing so they get probed first.
+    """
+
+    def cost(self, stats: InstanceStats) -> float:
+        return stats.latency * (stats.outstanding + 1)
+
+
+def is_prime(value: int) -> bool:
+    divisor = 2
+    while divisor * divisor <= value:
+        if value % divisor == 0:
+            return False
+        divisor += 1
+    return value >= 2
+
+
+class Maglev(Balancer):
+    """Consistent hashing on a Maglev lookup table for sticky routing by key.
+
+    The table is filled on membership changes so picks are a hash and an
+    index; a membership change only remaps about ``1 / len(instances)`` of
+    the keys. Instances are ordered by id before filling so every client
+    builds the same table, and the permutations of surviving instances are
+    reused across rebuilds. ``table_size`` must be prime and should be well
+    above the number of instances, 100 times gives ~1% imbalance. Picks
+    without a key fall back to a random slot. Use it with
+    ``Consul(passing=True)`` so critical instances never enter the table.
+    """
+
+    def __init__(self, table_size: int = 5003, **kwargs):
+        # a skip sharing a factor with the size would never fill the table
+        if not is_prime(table_size):
+            raise ValueError(f"table_size must be a prime, not {table_size}")
+        super().__init__(**kwargs)
+        self.table_size = table_size
+
+    def slot(self, key) -> int:
+        return hash_key(key) % self.table_size
+
+    def select(self, state, key=None):
+        if key is None:
+            return state.table[random.randrange(self.table_size)]
+        return state.table[self.slot(key)]
+
+    def available(self, state, position, key=None):
+        now = time.monotonic()
+        table = state.table
+        start = self.slot(key) if key is not None else random.randrange(len(table))
+        for offset in range(self.table_size):
+            candidate = table[(start + offset) % self.table_size]
+            if self._usable(state, candidate, now):
+                return candidate
+        return position
+
+    def rebuild(self, state, previous=None):
+        cached = getattr(previous, "permutations", {})
+        size = self.table_size
+        permutations = state.permutations = {}
+        for id_ in state.ids:
+            permutation = cached.get(id_)
+            if permutation is None:
+                permutation = (
+                    hash_key(id_, b"offset") % size,
+                    hash_key(id_, b"skip") % (size - 1) + 1,
+                )
+            permutations[id_] = permutation
+        ordered = sorted(permutations)
+        if previous is not None and getattr(previous, "ordered", None) == ordered:
+            # same instances in another order, only positions need remapping
+            remap = [state.index[id_] for id_ in previous.ids]
+            state.table = [remap[position] for position in previous.table]
+        else:
+            entries = self.populate([permutations[id_] for id_ in ordered])
+            positions = [state.index[id_] for id_ in ordered]
+            state.table = [positions[entry] for entry in entries]
+        state.ordered = ordered
+
+    def populate(self, permutations) -> list:
+        if not permutations:
+            raise ValueError("cannot build a lookup table without instances")
+        size = self.table_size
+        table = [-1] * size
+        taken = [0] * len(permutations)
+        filled = 0
+        while True:
+            for entry, (offset, skip) in enumerate(permutations):
+                slot = (offset + taken[entry] * skip) % size
+                while table[slot] >= 0:
+                    taken[entry] += 1
+                    slot = (offset + taken[entry] * skip) % size
+                table[slot] = entry
+                taken[entry] += 1
+                filled += 1
+                if filled == size:
+                    return table
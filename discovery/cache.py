@@ -0,0 +1,176 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from discovery import log
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "stale_until", "watch")
+
+    def __init__(self, value, expires, stale_until):
+        self.value = value
+        self.expires = expires
+        self.stale_until = stale_until
+        self.watch = None
+
+
+class ServiceCache:
+    """In-process cache for service lookups.
+
+    Entries are fresh for ``ttl`` seconds and may be served for another
+    ``stale_ttl`` seconds while a single background refresh runs. Empty
+    results (unknown services) are kept for ``negative_ttl`` seconds.
+    With ``watch=True`` entries are kept current by blocking queries and
+    only fall back to TTL expiry if the watch fails.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5,
+        stale_ttl: float = 30,
+        negative_ttl: float = 5,
+        maxsize: int = 1024,
+        watch: bool = False,
+        instrumentation=None,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"cache maxsize must be at least 1, not {maxsize}")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.watch = watch
+        self.instrumentation = instrumentation
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: dict = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    @property
+    def stats(self):
+        return dict(
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+        )
+
+    async def get(self, name, loader, watcher=None):
+        now = time.monotonic()
+        entry = self._entries.get(name)
+        if entry is not None:
+            self._entries.move_to_end(name)
+            if now < entry.expires:
+                self.hits += 1
+                self._record("hit")
+                return entry.value
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                self._record("stale")
+                self._refresh(name, loader, watcher)
+                return entry.value
+        self.misses += 1
+        self._record("miss")
+        return await asyncio.shield(self._refresh(name, loader, watcher))
+
+    def _record(self, result):
+        if self.instrumentation is not None:
+            self.instrumentation.cache(result)
+
+    def invalidate(self, name=None):
+        names = [name] if name is not None else list(self._entries)
+        for key in names:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._stop_watch(entry)
+
+    async def close(self):
+        self.invalidate()
+        for future in list(self._inflight.values()):
+            future.cancel()
+
+    def _refresh(self, name, loader, watcher):
+        future = self._inflight.get(name)
+        if future is None:
+            future = asyncio.ensure_future(self._load(name, loader, watcher))
+            future.add_done_callback(lambda f: self._done(name, f))
+            self._inflight[name] = future
+        return future
+
+    def _done(self, name, future):
+        # background refreshes have no awaiter to retrieve their error
+        if not future.cancelled() and future.exception() is not None:
+            log.warning(f"refresh of {name} failed: {future.exception()}")
+
+    async def _load(self, name, loader, watcher):
+        try:
+            value = await loader(name)
+            self._store(name, value)
+            entry = self._entries[name]
+            if self.watch and watcher is not None and entry.watch is None:
+                entry.watch = asyncio.ensure_future(
+                    self._follow(name, watcher(name, latest=True))
+                )
+            return value
+        finally:
+            self._inflight.pop(name, None)
+
+    def _store(self, name, value, ttl=None):
+        now = time.monotonic()
+        if ttl is None:
+            ttl = self.ttl if value else self.negative_ttl
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = _Entry(value, now + ttl, now + ttl + self.stale_ttl)
+            self._entries[name] = entry
+            self._evict()
+        else:
+            entry.value = value
+            entry.expires = now + ttl
+            entry.stale_until = now + ttl + self.stale_ttl
+        self._entries.move_to_end(name)
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            _, entry = self._entries.popitem(last=False)
+            self._stop_watch(entry)
+            self.evictions += 1
+
+    def _stop_watch(self, entry):
+        if entry.watch is not None:
+            entry.watch.cancel()
+            entry.watch = None
+
+    async def _follow(self, name, watch):
+        if self.instrumentation is not None:
+            self.instrumentation.add("discovery_cache_watches_active", 1)
+        try:
+            async for value in watch:
+                if name not in self._entries:
+                    break
+                self._store(name, value, ttl=float("inf"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            log.warning(f"watch for {name} failed, falling back to ttl: {err}")
+            if self.instrumentation is not None:
+                self.instrumentation.task_health("cache_watch", False)
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.add("discovery_cache_watches_active", -1)
+            await watch.close()
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry.watch = None
+                if entry.expires == float("inf"):
+                    self._store(name, entry.value)
@@ -1 +1,2 @@
+from discovery.cli.commands.bench import BenchCommand
 from discovery.cli.commands.catalog import CatalogCommand
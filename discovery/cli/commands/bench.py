@@ -0,0 +1,188 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from cleo import Command
+
+from discovery.client import Consul
+from discovery.engine import pooled_engine
+from discovery.metrics import Histogram
+
+OPERATIONS = ("catalog", "health", "kv_read", "kv_write", "register")
+
+
+def parse_mix(mix: str) -> dict:
+    """Parse ``catalog:40,health:40`` into normalized operation weights."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}, expected {OPERATIONS}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("operation mix must have a positive weight")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+class LoadGenerator:
+    """Drive Consul with a weighted mix of the client's real requests."""
+
+    def __init__(self, client, mix, concurrency=10, rate=0, service="consul", keys=100):
+        self.client = client
+        self.mix = mix
+        self.concurrency = concurrency
+        self.rate = rate
+        self.service = service
+        self.keys = keys
+        self.histograms = {name: Histogram() for name in mix}
+        self.errors = dict.fromkeys(mix, 0)
+        self.elapsed = 0.0
+        self._issued = 0
+
+    async def catalog(self, n):
+        return await self.client.catalog.service(self.service)
+
+    async def health(self, n):
+        return await self.client.health.service(self.service, params={"passing": 1})
+
+    async def kv_read(self, n):
+        return await self.client.kv.read(f"discovery-bench/{n % self.keys}")
+
+    async def kv_write(self, n):
+        return await self.client.kv.update(f"discovery-bench/{n % self.keys}", b"1")
+
+    async def register(self, n):
+        service_id = f"discovery-bench-{uuid.uuid4().hex}"
+        await self.client.agent.service.register(
+            {"Name": "discovery-bench", "ID": service_id, "Port": 8080}
+        )
+        return await self.client.agent.service.deregister(service_id)
+
+    async def _throttle(self, start):
+        if not self.rate:
+            return
+        slot = start + self._issued / self.rate
+        self._issued += 1
+        delay = slot - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _worker(self, start, until):
+        names, weights = list(self.mix), list(self.mix.values())
+        n = 0
+        while True:
+            await self._throttle(start)
+            if time.monotonic() >= until:
+                return
+            name = random.choices(names, weights)[0]
+            begin = time.monotonic()
+            try:
+                response = await getattr(self, name)(n)
+                # time the whole exchange, large catalog bodies included
+                await response.content()
+                if response.status >= 500:
+                    self.errors[name] += 1
+            except Exception:
+                self.errors[name] += 1
+            self.histograms[name].observe(time.monotonic() - begin)
+            n += 1
+
+    async def run(self, duration):
+        start = time.monotonic()
+        await asyncio.gather(
+            *(self._worker(start, start + duration) for _ in range(self.concurrency))
+        )
+        self.elapsed = time.monotonic() - start
+        return self.results()
+
+    def results(self) -> dict:
+        operations = {}
+        for name, histogram in self.histograms.items():
+            operations[name] = dict(
+                requests=histogram.count,
+                errors=self.errors[name],
+                error_rate=(
+                    self.errors[name] / histogram.count if histogram.count else 0
+                ),
+                rps=histogram.count / self.elapsed if self.elapsed else 0,
+                mean=histogram.sum / histogram.count if histogram.count else 0,
+                p50=histogram.quantile(0.5),
+                p90=histogram.quantile(0.9),
+                p99=histogram.quantile(0.99),
+                buckets=[
+                    [bound if bound != float("inf") else "+Inf", total]
+                    for bound, total in histogram.cumulative()
+                ],
+            )
+        return dict(
+            duration=self.elapsed,
+            concurrency=self.concurrency,
+            rate=self.rate,
+            operations=operations,
+        )
+
+
+class BenchCommand(Command):
+    """
+    Generate load against Consul with the client's request patterns.
+
+    bench
+        {--c|concurrency=10 : Number of concurrent workers.}
+        {--r|rate=0 : Target requests per second, 0 for unlimited.}
+        {--d|duration=10 : Duration of the run in seconds.}
+        {--m|mix=catalog:40,health:40,kv_read:10,kv_write:5,register:5 : Weighted operations.}
+        {--s|service=consul : Service queried by catalog and health operations.}
+        {--o|output= : Write results as JSON to <file>.}
+    """
+
+    def handle(self):
+        try:
+            mix = parse_mix(self.option("mix"))
+        except ValueError as err:
+            self.line(f"<error>[!]</error> {err}")
+            return 1
+        loop = asyncio.get_event_loop()
+        results = loop.run_until_complete(self.bench(mix))
+        self.report(results)
+        if self.option("output"):
+            with open(self.option("output"), "w") as f:
+                json.dump(results, f, indent=2)
+        return 1 if any(op["errors"] for op in results["operations"].values()) else 0
+
+    async def bench(self, mix):
+        concurrency = int(self.option("concurrency"))
+        engine = await pooled_engine(pool_size=concurrency)
+        generator = LoadGenerator(
+            Consul(engine),
+            mix,
+            concurrency=concurrency,
+            rate=float(self.option("rate")),
+            service=self.option("service"),
+        )
+        try:
+            return await generator.run(float(self.option("duration")))
+        finally:
+            await engine.close()
+
+    def report(self, results):
+        self.line(
+            f"<info>{results['duration']:.1f}s</info> with "
+            f"<info>{results['concurrency']}</info> workers"
+        )
+        for name, op in results["operations"].items():
+            self.line(
+                f"{name:<10} {op['requests']:>8} req {op['rps']:>9.1f} req/s "
+                f"{op['error_rate']:>7.2%} errors  p50<={op['p50'] * 1000:g}ms "
+                f"p90<={op['p90'] * 1000:g}ms p99<={op['p99'] * 1000:g}ms"
+            )
+            if self.io.is_verbose():
+                previous = 0
+                for bound, total in op["buckets"]:
+                    count = total - previous
+                    previous = total
+                    if count:
+                        bar = "#" * max(1, 40 * count // max(1, op["requests"]))
+                        self.line(f"    <= {bound!s:>6}s {count:>8} {bar}")
@@ -1,12 +1,14 @@
 import asyncio
 import json
 import pickle
+from typing import Optional
 
 from discovery import log
 from discovery.abc import BaseClient
+from discovery.balancer import OutlierDetector, RoundRobin
 from discovery.exceptions import NoConsulLeaderException, ServiceNotFoundException
 from discovery.model.agent.service import service
-from discovery.utils import select_one_rr
+from discovery.utils import instance_id
 
 
 class Consul(BaseClient):
@@ -15,21 +17,57 @@ class Consul(BaseClient):
         self.managed_services = {}
         self._leader_id = None
         self.consul_current_leader_id = None
+        self.cache = kwargs.get("cache")
+        # look services up through health, keeping passing instances only
+        self.passing = bool(kwargs.get("passing", False))
+        balancer = kwargs.get("balancer")
+        # balancers define __len__, so an empty one is falsy
+        if balancer is None:
+            balancer = RoundRobin(outlier=OutlierDetector())
+        self.balancer = balancer
 
-    async def find_service(self, name, fn=select_one_rr):
+    @property
+    def instrumentation(self):
+        return getattr(self.client, "instrumentation", None)
+
+    async def find_service(self, name, fn=None, key=None):
         response = await self.find_services(name)
         try:
-            return fn(response)
+            if fn is None:
+                selected = self.balancer.pick(name, response, key)
+            else:
+                selected = fn(response)
         except Exception:
             raise ServiceNotFoundException(
                 f"service {name} not found in the Consul's catalog"
             )
+        if self.instrumentation is not None:
+            self.instrumentation.pick(name, instance_id(selected))
+        return selected
+
+    def report(
+        self, name, instance, latency: Optional[float] = None, error: bool = False
+    ):
+        """Feed a request outcome for a ``find_service`` pick to the balancer."""
+        self.balancer.report(name, instance, latency, error)
 
     async def find_services(self, name):
-        resp = await self.catalog.service(name)
+        if self.cache is None:
+            return await self._find_services(name)
+        watcher = self._watch_passing if self.passing else self.catalog.watch_service
+        return await self.cache.get(name, self._find_services, watcher)
+
+    async def _find_services(self, name):
+        if self.passing:
+            resp = await self.health.service(name, params={"passing": 1})
+        else:
+            resp = await self.catalog.service(name)
         response = await self._get_response(resp)
         return response
 
+    def _watch_passing(self, name, **kwargs):
+        return self.health.watch_service(name, params={"passing": 1}, **kwargs)
+
     async def register(
         self, service_name: str, service_port: int, check=None, dump_service=True
     ) -> None:
@@ -58,9 +96,14 @@ class Consul(BaseClient):
                 current_id = await self.leader_current_id()
                 if current_id != self.consul_current_leader_id:
                     await self.reconnect()
-            except Exception:
-                await asyncio.sleep(self.timeout)
-                await self.check_consul_health()
+                self._task_health(True)
+            except Exception as err:
+                log.warning(f"Consul health check failed: {err}")
+                self._task_health(False)
+
+    def _task_health(self, up):
+        if self.instrumentation is not None:
+            self.instrumentation.task_health("consul_health", up)
 
     async def reconnect(self):
         old_service = self.managed_services.copy()
@@ -1,2 +1,8 @@
 from discovery.engine.abc import Engine
 from discovery.engine.aio import AioEngine, aiohttp_session, httpx_client
+from discovery.engine.deadline import deadline
+from discovery.engine.failover import Endpoint, FailoverEngine
+from discovery.engine.hedge import HedgingPolicy
+from discovery.engine.pool import pooled_engine
+from discovery.engine.retry import CircuitBreaker, RetryBudget, RetryPolicy
+from discovery.engine.watch import Watch
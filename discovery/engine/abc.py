@@ -1,12 +1,27 @@
 import abc
 import os
+from typing import Optional
+
+UNIX_SCHEME = "unix://"
+
+
+def unix_socket_path(address: Optional[str] = None) -> Optional[str]:
+    address = address or os.getenv("CONSUL_HOST", "")
+    if str(address).startswith(UNIX_SCHEME):
+        return str(address)[len(UNIX_SCHEME) :]
+    return None
 
 
 class Engine(abc.ABC):
+    instrumentation = None
+
     def __init__(self, host: str = "localhost", port: int = 8500, scheme: str = "http"):
         self._host = str(os.getenv("CONSUL_HOST", host))
         self._port = int(os.getenv("CONSUL_PORT", port))
         self._scheme = str(os.getenv("CONSUL_SCHEMA", scheme))
+        self._uds = unix_socket_path(self._host)
+        if self._uds:
+            self._host = "localhost"
 
     @property
     def host(self):
@@ -20,8 +35,14 @@ class Engine(abc.ABC):
     def scheme(self):
         return self._scheme
 
+    @property
+    def uds(self):
+        return self._uds
+
     @property
     def url(self):
+        if self._uds:
+            return f"{self.scheme}://{self.host}"
         return f"{self.scheme}://{self.host}:{self.port}"
 
     async def get(self, *args, **kwargs):
@@ -1,7 +1,15 @@
+import asyncio
 from contextlib import suppress
+from typing import Optional
+from urllib.parse import urlsplit
 
-from discovery.engine.abc import Engine
-from discovery.engine.response import HttpResponse
+from discovery.engine.abc import Engine, unix_socket_path
+from discovery.engine.codec import get_codec
+from discovery.engine.coalesce import RequestCoalescer, request_key
+from discovery.engine.deadline import deadline, enforce, remaining
+from discovery.engine.hedge import hedged
+from discovery.engine.response import HttpResponse, SharedResponse
+from discovery.metrics import route_name
 
 has_httpx = False
 has_aiohttp = False
@@ -10,43 +18,232 @@ with suppress(ImportError):
     import aiohttp
 
     has_aiohttp = True
+
+with suppress(ImportError):
     import httpx
 
     has_httpx = True
 
 
 class AioEngine(Engine):
-    def __init__(self, session=None, **kwargs):
+    def __init__(
+        self,
+        session=None,
+        retry_policy=None,
+        circuit_breaker=None,
+        coalesce: bool = False,
+        codec=None,
+        hedging=None,
+        timeout: Optional[float] = None,
+        instrumentation=None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._session = session
+        self.codec = codec if hasattr(codec, "loads") else get_codec(codec)
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self._coalescer = RequestCoalescer() if coalesce else None
+        self.hedging = hedging
+        self.timeout = timeout
+        self.instrumentation = instrumentation
+
+    async def request(self, method, url, **kwargs):
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+        elif isinstance(kwargs.get("data"), (dict, list)):
+            kwargs["data"] = self.codec.dumps(kwargs["data"])
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return await self._bounded(method, url, **kwargs)
+        route = route_name(method, url)
+        start = instrumentation.request_started(route, method, kwargs.get("data"))
+        response = None
+        try:
+            response = await self._bounded(method, url, **kwargs)
+            return response
+        finally:
+            instrumentation.request_finished(route, method, start, response)
+
+    async def _bounded(self, method, url, **kwargs):
+        timeout = kwargs.pop("deadline", None) or self.timeout
+        if timeout is None:
+            return await enforce(self._complete(method, url, **kwargs))
+        with deadline(timeout):
+            return await enforce(self._complete(method, url, **kwargs))
+
+    async def _complete(self, method, url, **kwargs):
+        response = await self._coalesced(method, url, **kwargs)
+        if remaining() is None or kwargs.get("stream"):
+            return response
+        # read the body under the deadline too, aiohttp only waits for headers
+        try:
+            await response.content()
+        except BaseException:
+            with suppress(Exception):
+                await response.close()
+            raise
+        return response
+
+    async def _coalesced(self, method, url, **kwargs):
+        if (
+            self._coalescer is not None
+            and method == "GET"
+            and set(kwargs) <= {"params", "headers"}
+        ):
+            key = request_key(url, **kwargs)
+            return await self._coalescer.do(
+                key, lambda: self._shared_request(method, url, **kwargs)
+            )
+        return await self._request(method, url, **kwargs)
+
+    async def _shared_request(self, method, url, **kwargs):
+        response = await self._request(method, url, **kwargs)
+        body = await response.content()
+        with suppress(Exception):
+            await response.close()
+        return SharedResponse(response.raw_response, body, self.codec)
+
+    async def _request(self, method, url, **kwargs):
+        policy = self.retry_policy
+        if policy is None:
+            return await self._attempt(method, url, **kwargs)
+        policy.budget.deposit()
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await self._attempt(method, url, **kwargs)
+            except Exception as err:
+                error = err
+            delay = policy.delay(attempt)
+            budget = remaining()
+            if (budget is not None and delay >= budget) or not policy.should_retry(
+                method, attempt, response=response, error=error
+            ):
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                with suppress(Exception):
+                    await response.close()
+            if self.instrumentation is not None:
+                self.instrumentation.retry(route_name(method, url))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(self, method, url, **kwargs):
+        if self.hedging is None or not self.hedging.applies(method, url, **kwargs):
+            return await self._send(method, url, **kwargs)
+        return await hedged(
+            self.hedging,
+            lambda: self._send(method, url, **kwargs),
+            lambda: self._send_hedge(method, url, **kwargs),
+        )
+
+    async def _send(self, method, url, **kwargs):
+        return await self._dispatch(method, url, **kwargs)
+
+    async def _send_hedge(self, method, url, **kwargs):
+        return await self._send(method, url, **kwargs)
+
+    async def _session_request(self, method, url, stream=False, **kwargs):
+        if stream and has_httpx and isinstance(self._session, httpx.AsyncClient):
+            request = self._session.build_request(method, url, **kwargs)
+            return await self._session.send(request, stream=True)
+        return await self._session.request(method, url, **kwargs)
+
+    async def _dispatch(self, method, url, **kwargs):
+        breaker = self.circuit_breaker
+        if breaker is None:
+            response = await self._session_request(method, url, **kwargs)
+            return self._response(response, method, url)
+        key = urlsplit(url).netloc
+        breaker.before(key)
+        try:
+            response = await self._session_request(method, url, **kwargs)
+            response = self._response(response, method, url)
+        except Exception:
+            breaker.failure(key)
+            raise
+        if response.status >= 500:
+            breaker.failure(key)
+        else:
+            breaker.success(key)
+        return response
+
+    def _response(self, response, method, url):
+        # bytes are counted as the body is read, Consul chunks large replies
+        if self.instrumentation is None:
+            return HttpResponse(response, self.codec)
+        route = route_name(method, url)
+        return HttpResponse(response, self.codec, self.instrumentation, route)
 
     async def get(self, *args, **kwargs):
-        response = await self._session.get(*args, **kwargs)
-        return HttpResponse(response)
+        return await self.request("GET", *args, **kwargs)
 
     async def put(self, *args, **kwargs):
-        response = await self._session.put(*args, **kwargs)
-        return HttpResponse(response)
+        return await self.request("PUT", *args, **kwargs)
 
     async def delete(self, *args, **kwargs):
-        response = await self._session.delete(*args, **kwargs)
-        return HttpResponse(response)
+        return await self.request("DELETE", *args, **kwargs)
 
     async def post(self, *args, **kwargs):
-        response = await self._session.post(*args, **kwargs)
-        return HttpResponse(response)
+        return await self.request("POST", *args, **kwargs)
+
+    def pool_stats(self) -> dict:
+        """Connection pool usage, ``None`` where the backend hides it."""
+        connector = getattr(self._session, "connector", None)
+        if connector is not None:
+            stats = dict(
+                limit=connector.limit,
+                limit_per_host=connector.limit_per_host,
+                in_use=None,
+                idle=None,
+            )
+            # aiohttp keeps pool usage in private attributes only
+            with suppress(AttributeError, TypeError):
+                stats["in_use"] = len(connector._acquired)
+                stats["idle"] = sum(len(conns) for conns in connector._conns.values())
+            return stats
+        pool = getattr(getattr(self._session, "_transport", None), "_pool", None)
+        if pool is not None:
+            stats = dict(
+                limit=getattr(pool, "_max_connections", None),
+                limit_per_host=0,
+                in_use=None,
+                idle=None,
+            )
+            with suppress(AttributeError, TypeError):
+                connections = list(pool.connections)
+                idle = sum(1 for conn in connections if conn.is_idle())
+                stats.update(in_use=len(connections) - idle, idle=idle)
+            return stats
+        return {}
+
+    async def close(self) -> None:
+        try:
+            await self._session.aclose()
+        except AttributeError:
+            await self._session.close()
 
     async def __aexit__(self, *args, **kwargs):
-        await self._session.close()
+        await self.close()
 
 
-async def aiohttp_session(*args, **kwargs):
+async def aiohttp_session(*args, uds: Optional[str] = None, **kwargs):
     if not has_aiohttp:
         raise ModuleNotFoundError("aiohttp module not found!")
+    uds = uds or unix_socket_path()
+    if uds and "connector" not in kwargs:
+        kwargs["connector"] = aiohttp.UnixConnector(path=uds)
     return aiohttp.ClientSession(*args, **kwargs)
 
 
-async def httpx_client(*args, **kwargs):
+async def httpx_client(*args, uds: Optional[str] = None, **kwargs):
     if not has_httpx:
         raise ModuleNotFoundError("httpx module not found!")
+    uds = uds or unix_socket_path()
+    if uds and "transport" not in kwargs:
+        kwargs["transport"] = httpx.AsyncHTTPTransport(uds=uds)
     return httpx.AsyncClient(*args, **kwargs)
@@ -0,0 +1,37 @@
+import asyncio
+
+
+class RequestCoalescer:
+    """Share a single in-flight call between callers using the same key."""
+
+    def __init__(self):
+        self._inflight: dict = {}
+
+    def __len__(self):
+        return len(self._inflight)
+
+    async def do(self, key, fn):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        return await asyncio.shield(future)
+
+    def _done(self, key, future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+
+def request_key(url, params=None, headers=None):
+    if params is None:
+        params = ()
+    elif isinstance(params, dict):
+        params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+    else:
+        params = tuple(params)
+    headers = headers or {}
+    token = headers.get("X-Consul-Token") or headers.get("Authorization")
+    return (url, params, token)
@@ -0,0 +1,63 @@
+import json
+from contextlib import suppress
+
+has_orjson = False
+has_ujson = False
+
+with suppress(ImportError):
+    import orjson
+
+    has_orjson = True
+
+with suppress(ImportError):
+    import ujson
+
+    has_ujson = True
+
+
+class JsonCodec:
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class UJsonCodec(JsonCodec):
+    name = "ujson"
+
+    def dumps(self, obj) -> bytes:
+        data: str = ujson.dumps(obj, ensure_ascii=False)
+        return data.encode("utf-8")
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+class OrJsonCodec(JsonCodec):
+    name = "orjson"
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+def get_codec(name=None) -> JsonCodec:
+    """Return the named codec or the fastest one installed."""
+    available = {"json": JsonCodec}
+    if has_ujson:
+        available["ujson"] = UJsonCodec
+    if has_orjson:
+        available["orjson"] = OrJsonCodec
+    if name is None:
+        name = next(n for n in ("orjson", "ujson", "json") if n in available)
+    if name not in available:
+        raise ModuleNotFoundError(f"{name} module not found!")
+    return available[name]()
+
+
+default_codec = get_codec()
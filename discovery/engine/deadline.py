@@ -0,0 +1,48 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from discovery.exceptions import DeadlineExceededException
+
+_deadline: "ContextVar[Optional[float]]" = ContextVar(
+    "discovery_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(timeout: float):
+    """Bound every request made inside the block to ``timeout`` seconds.
+
+    Nested blocks can only shorten the deadline inherited from the caller.
+    """
+    expires = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield expires
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+async def enforce(coro):
+    timeout = remaining()
+    if timeout is None:
+        return await coro
+    if timeout <= 0:
+        coro.close()
+        raise DeadlineExceededException("deadline exceeded")
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        raise DeadlineExceededException(f"deadline of {timeout:.3f}s exceeded")
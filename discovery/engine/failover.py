@@ -0,0 +1,204 @@
+import asyncio
+import os
+import time
+from typing import Dict
+from urllib.parse import urlsplit, urlunsplit
+
+from discovery import log
+from discovery.engine.aio import AioEngine
+from discovery.engine.retry import (
+    CONNECT_ERRORS,
+    CONNECTION_ERRORS,
+    IDEMPOTENT_METHODS,
+)
+from discovery.exceptions import CircuitBreakerOpenException
+
+
+class Endpoint:
+    def __init__(self, host: str, port: int, scheme: str = "http"):
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"Endpoint(url={self.url}, latency={self.latency:.4f}, "
+            f"error_rate={self.error_rate:.2f}, ejected={self.ejected_until > 0})"
+        )
+
+    @classmethod
+    def parse(cls, address: str, port: int = 8500, scheme: str = "http"):
+        if "://" in address:
+            scheme, address = address.split("://", 1)
+        host, _, address_port = address.rpartition(":")
+        if not host or not address_port.isdigit():
+            host, address_port = address, str(port)
+        return cls(host, int(address_port), scheme)
+
+    @property
+    def netloc(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def url(self) -> str:
+        return f"{self.scheme}://{self.netloc}"
+
+    @property
+    def score(self) -> float:
+        return self.latency * (1 + 10 * self.error_rate)
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def success(self, latency: float, alpha: float) -> None:
+        if self.latency:
+            latency = alpha * latency + (1 - alpha) * self.latency
+        self.latency = latency
+        self.error_rate *= 1 - alpha
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def failure(self, alpha: float) -> None:
+        self.error_rate = alpha + (1 - alpha) * self.error_rate
+        self.failures += 1
+
+    def eject(self, now: float, base: float, maximum: float) -> None:
+        self.ejections += 1
+        self.ejected_until = now + min(maximum, base * 2 ** (self.ejections - 1))
+
+
+class FailoverEngine(AioEngine):
+    """AioEngine spreading requests over several Consul agents/servers.
+
+    Requests are sent to the endpoint with the best EWMA latency and error
+    rate; endpoints failing ``max_failures`` times in a row are ejected with
+    exponential back-off and tried again once their ejection expires.
+    Connect failures are transparently failed over to the next endpoint;
+    other transport errors, such as read timeouts, only for idempotent verbs.
+    """
+
+    def __init__(
+        self,
+        session=None,
+        endpoints=None,
+        alpha: float = 0.3,
+        max_failures: int = 3,
+        ejection_time: float = 5,
+        max_ejection_time: float = 300,
+        **kwargs,
+    ):
+        super().__init__(session, **kwargs)
+        endpoints = endpoints or os.getenv("CONSUL_HOSTS", "").split(",")
+        endpoints = [address.strip() for address in endpoints if address.strip()]
+        self._endpoints: Dict[str, Endpoint] = {}
+        for address in endpoints or [f"{self.host}:{self.port}"]:
+            self.add_endpoint(address)
+        self.alpha = alpha
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+
+    @property
+    def endpoints(self):
+        return list(self._endpoints.values())
+
+    def add_endpoint(self, address: str) -> Endpoint:
+        endpoint = Endpoint.parse(address, self.port, self.scheme)
+        return self._endpoints.setdefault(endpoint.netloc, endpoint)
+
+    def candidates(self):
+        now = time.monotonic()
+        endpoints = sorted(self._endpoints.values(), key=lambda e: e.score)
+        available = [e for e in endpoints if e.available(now)]
+        return available or sorted(endpoints, key=lambda e: e.ejected_until)
+
+    def _record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.failure(self.alpha)
+        if endpoint.failures >= self.max_failures:
+            endpoint.eject(time.monotonic(), self.ejection_time, self.max_ejection_time)
+            log.warning(f"{endpoint.url} ejected after {endpoint.failures} failures")
+
+    def _idempotent(self, method: str) -> bool:
+        if self.retry_policy is not None:
+            return bool(self.retry_policy.idempotent(method))
+        return method.upper() in IDEMPOTENT_METHODS
+
+    async def _send(self, method, url, **kwargs):
+        return await self._send_to(self.candidates(), method, url, **kwargs)
+
+    async def _send_hedge(self, method, url, **kwargs):
+        candidates = self.candidates()
+        candidates = candidates[1:] + candidates[:1]
+        return await self._send_to(candidates, method, url, **kwargs)
+
+    async def _send_to(self, candidates, method, url, **kwargs):
+        parts = urlsplit(url)
+        for attempt, endpoint in enumerate(candidates, 1):
+            target = urlunsplit((endpoint.scheme, endpoint.netloc) + tuple(parts[2:]))
+            start = time.monotonic()
+            try:
+                response = await self._dispatch(method, target, **kwargs)
+            except CircuitBreakerOpenException:
+                if attempt == len(candidates):
+                    raise
+                continue
+            except CONNECTION_ERRORS as err:
+                self._record_failure(endpoint)
+                if attempt == len(candidates) or not (
+                    isinstance(err, CONNECT_ERRORS) or self._idempotent(method)
+                ):
+                    raise
+                log.debug(f"{endpoint.url} unreachable, failing over")
+                continue
+            except Exception:
+                self._record_failure(endpoint)
+                raise
+            if response.status >= 500:
+                self._record_failure(endpoint)
+            else:
+                endpoint.success(time.monotonic() - start, self.alpha)
+            return response
+
+    async def refresh(self, status=None):
+        """Add the cluster peers and probe ejected endpoints."""
+        from discovery import api
+
+        status = status or api.Status(client=self)
+        try:
+            response = await status.peers()
+            for peer in await response.json():
+                host, _, _ = str(peer).rpartition(":")
+                self.add_endpoint(f"{host}:{self.port}")
+        except Exception as err:
+            log.warning(f"refresh of consul peers failed: {err}")
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if endpoint.ejected_until and endpoint.available(now):
+                await self.probe(endpoint)
+
+    async def probe(self, endpoint: Endpoint) -> bool:
+        start = time.monotonic()
+        try:
+            url = f"{endpoint.url}/v1/status/leader"
+            response = await self._dispatch("GET", url)
+            healthy = bool(response.status == 200)
+        except Exception:
+            healthy = False
+        if healthy:
+            endpoint.success(time.monotonic() - start, self.alpha)
+            log.info(f"{endpoint.url} restored")
+        else:
+            endpoint.failure(self.alpha)
+            endpoint.eject(time.monotonic(), self.ejection_time, self.max_ejection_time)
+        return healthy
+
+    async def run(self, interval: float = 30):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(interval)
@@ -0,0 +1,110 @@
+import asyncio
+import math
+from collections import deque
+from contextlib import suppress
+from typing import Optional
+from urllib.parse import urlsplit
+
+from discovery.engine.retry import RetryBudget
+
+MIN_SAMPLES = 100
+RECOMPUTE_EVERY = 10
+
+
+class HedgingPolicy:
+    """Send a duplicate read when the first one is slower than usual.
+
+    The hedge is sent once a request is slower than the ``percentile`` of
+    recently observed latencies (clamped to ``min_delay``/``max_delay``),
+    or after ``max_delay`` until ``MIN_SAMPLES`` latencies were observed.
+    Hedges are capped to ``ratio`` of the eligible requests, so with the
+    maximum ratio of 1 the load can at most double.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_delay: float = 0.005,
+        max_delay: float = 1,
+        ratio: float = 0.1,
+        window: int = 1000,
+        routes=("/v1/health/", "/v1/catalog/", "/v1/kv/"),
+    ):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.routes = tuple(routes)
+        self.budget = RetryBudget(ratio=min(ratio, 1), min_tokens=0)
+        self.hedged = 0
+        self._latencies: deque = deque(maxlen=window)
+        self._delay = max_delay
+        self._samples = 0
+
+    def applies(self, method: str, url: str, **kwargs) -> bool:
+        if method != "GET" or "index" in (kwargs.get("params") or {}):
+            return False
+        return urlsplit(url).path.startswith(self.routes)
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    def record(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._samples += 1
+        if self._samples >= MIN_SAMPLES and self._samples % RECOMPUTE_EVERY == 0:
+            ordered = sorted(self._latencies)
+            index = max(0, math.ceil(len(ordered) * self.percentile) - 1)
+            self._delay = min(self.max_delay, max(self.min_delay, ordered[index]))
+
+    def acquire(self) -> bool:
+        if self.budget.withdraw():
+            self.hedged += 1
+            return True
+        return False
+
+
+async def _close(response) -> None:
+    with suppress(Exception):
+        await response.close()
+
+
+def discard(task) -> None:
+    """Cancel a losing request and close its response if it completed."""
+
+    def release(task):
+        if not task.cancelled() and task.exception() is None:
+            asyncio.ensure_future(_close(task.result()))
+
+    if task.done():
+        release(task)
+    else:
+        task.cancel()
+        task.add_done_callback(release)
+
+
+async def hedged(policy: HedgingPolicy, primary, hedge):
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    policy.budget.deposit()
+    tasks = {asyncio.ensure_future(primary())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=policy.delay)
+        if not done and policy.acquire():
+            tasks.add(asyncio.ensure_future(hedge()))
+        error: Optional[BaseException] = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in done if t.exception() is None), None)
+            if winner is not None:
+                policy.record(loop.time() - start)
+                for task in done - {winner}:
+                    discard(task)
+                return winner.result()
+            error = next(iter(done)).exception()
+        # the primary task is always awaited, so an error is set here
+        assert error is not None
+        raise error
+    finally:
+        for task in tasks:
+            discard(task)
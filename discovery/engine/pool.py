@@ -0,0 +1,98 @@
+import inspect
+import socket
+from typing import Any, Dict, Optional
+
+from discovery.engine.abc import unix_socket_path
+from discovery.engine.aio import AioEngine, has_aiohttp, has_httpx
+
+if has_aiohttp:
+    import aiohttp
+
+if has_httpx:
+    import httpx
+
+
+def aiohttp_connector(
+    pool_size: int = 100,
+    limit_per_host: int = 0,
+    keepalive_timeout: float = 30,
+    dns_ttl: int = 10,
+    uds: Optional[str] = None,
+):
+    if not has_aiohttp:
+        raise ModuleNotFoundError("aiohttp module not found!")
+    if uds:
+        return aiohttp.UnixConnector(
+            path=uds,
+            limit=pool_size,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+        )
+    return aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        use_dns_cache=bool(dns_ttl),
+        ttl_dns_cache=dns_ttl or None,
+    )
+
+
+def httpx_transport(
+    pool_size: int = 100,
+    keepalive_timeout: float = 30,
+    tcp_nodelay: bool = True,
+    http2: bool = False,
+    uds: Optional[str] = None,
+):
+    if not has_httpx:
+        raise ModuleNotFoundError("httpx module not found!")
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=keepalive_timeout,
+    )
+    options: Dict[str, Any] = dict(limits=limits, http2=http2, uds=uds)
+    # socket_options is only accepted from httpx 0.25
+    parameters = inspect.signature(httpx.AsyncHTTPTransport).parameters
+    if tcp_nodelay and not uds and "socket_options" in parameters:
+        options["socket_options"] = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    return httpx.AsyncHTTPTransport(**options)
+
+
+async def pooled_engine(
+    backend: str = "aiohttp",
+    pool_size: int = 100,
+    limit_per_host: int = 0,
+    keepalive_timeout: float = 30,
+    dns_ttl: int = 10,
+    tcp_nodelay: bool = True,
+    http2: bool = False,
+    uds: Optional[str] = None,
+    engine_cls=AioEngine,
+    session_kwargs: Optional[dict] = None,
+    **kwargs,
+):
+    """Build an engine over a tuned, pooled aiohttp or httpx session.
+
+    aiohttp always enables TCP_NODELAY and supports per-host limits and DNS
+    caching; httpx supports HTTP/2 (requires the ``h2`` package) and sets
+    TCP_NODELAY from httpx 0.25.
+    """
+    uds = uds or unix_socket_path(kwargs.get("host"))
+    session_kwargs = session_kwargs or {}
+    session: Any
+    if backend == "aiohttp":
+        if http2:
+            raise ValueError("aiohttp does not support HTTP/2")
+        connector = aiohttp_connector(
+            pool_size, limit_per_host, keepalive_timeout, dns_ttl, uds
+        )
+        session = aiohttp.ClientSession(connector=connector, **session_kwargs)
+    elif backend == "httpx":
+        transport = httpx_transport(
+            pool_size, keepalive_timeout, tcp_nodelay, http2, uds
+        )
+        session = httpx.AsyncClient(transport=transport, **session_kwargs)
+    else:
+        raise ValueError(f'backend must be "aiohttp" or "httpx", not {backend!r}')
+    return engine_cls(session, **kwargs)
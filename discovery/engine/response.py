@@ -1,6 +1,21 @@
+from typing import Optional
+
+from discovery.engine.codec import default_codec
+
+_MISSING = object()
+
+
 class HttpResponse:
-    def __init__(self, response):
+    def __init__(
+        self, response, codec=None, instrumentation=None, route: str = ""
+    ) -> None:
         self._response = response
+        self._codec = codec or default_codec
+        self._body: Optional[bytes] = None
+        self._text: Optional[str] = None
+        self._json = _MISSING
+        self._instrumentation = instrumentation
+        self._route = route
 
     @property
     def status(self) -> int:
@@ -28,27 +43,76 @@ class HttpResponse:
         except AttributeError:
             return str(self._response.http_version.split("/")[1])
 
+    @property
+    def headers(self):
+        return self._response.headers
+
     @property
     def raw_response(self):
         return self._response
 
-    async def json(self):
+    @property
+    def encoding(self) -> str:
         try:
-            response = await self._response.json()
-            return response
-        except TypeError:
-            return self._response.json()
+            return str(self._response.get_encoding())
+        except (AttributeError, RuntimeError):
+            return str(getattr(self._response, "encoding", None) or "utf-8")
+
+    async def json(self):
+        if self._json is _MISSING:
+            self._json = self._decode(await self.content())
+        return self._json
 
     async def text(self):
-        try:
-            response = await self._response.text()
-            return response
-        except TypeError:
-            return self._response.text
+        if self._text is None:
+            self._text = (await self.content()).decode(self.encoding)
+        return self._text
 
     async def content(self) -> bytes:
+        if self._body is None:
+            read = getattr(self._response, "aread", None) or self._response.read
+            self._body = bytes(await read())
+            self._received(len(self._body))
+        return self._body
+
+    async def iter_chunks(self, chunk_size: int = 65536):
+        if self._body is not None:
+            for start in range(0, len(self._body), chunk_size):
+                yield self._body[start : start + chunk_size]
+            return
+        if hasattr(self._response, "aiter_bytes"):
+            chunks = self._response.aiter_bytes()
+        else:
+            chunks = self._response.content.iter_chunked(chunk_size)
+        async for chunk in chunks:
+            self._received(len(chunk))
+            yield bytes(chunk)
+
+    async def close(self) -> None:
         try:
-            response = await self._response.content.read()
-            return bytes(response)
+            await self._response.aclose()
         except AttributeError:
-            return bytes(self._response.content)
+            self._response.release()
+
+    def _received(self, size: int) -> None:
+        if self._instrumentation is not None and size:
+            self._instrumentation.response_bytes(self._route, size)
+
+    def _decode(self, body: bytes):
+        if not body.strip():
+            return None
+        return self._codec.loads(body)
+
+
+class SharedResponse(HttpResponse):
+    """Fully read response that can be handed to several consumers.
+
+    JSON is decoded per call so consumers never share mutable objects.
+    """
+
+    def __init__(self, response, body: bytes, codec=None):
+        super().__init__(response, codec)
+        self._body = bytes(body)
+
+    async def json(self):
+        return self._decode(self._body)
@@ -0,0 +1,155 @@
+import asyncio
+import random
+import time
+from contextlib import suppress
+from typing import Optional
+
+from discovery.exceptions import CircuitBreakerOpenException
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "DELETE")
+
+# Raised before the request reached Consul, safe to resend whatever the verb.
+CONNECT_ERRORS: tuple = (ConnectionRefusedError,)
+# Transport errors after which only idempotent requests may be resent.
+CONNECTION_ERRORS: tuple = (ConnectionError, asyncio.TimeoutError)
+
+with suppress(ImportError):
+    import aiohttp
+
+    CONNECT_ERRORS += (aiohttp.ClientConnectorError,)
+    if hasattr(aiohttp, "ConnectionTimeoutError"):
+        CONNECT_ERRORS += (aiohttp.ConnectionTimeoutError,)
+
+with suppress(ImportError):
+    import httpx
+
+    CONNECT_ERRORS += (httpx.ConnectError, httpx.ConnectTimeout)
+
+CONNECTION_ERRORS += CONNECT_ERRORS
+
+
+class RetryBudget:
+    """Token bucket capping retries to a ratio of the requests sent.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one,
+    ``min_tokens`` are always available so low traffic can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_tokens: float = 10, max_tokens=100):
+        self.ratio = ratio
+        self.min_tokens = min_tokens
+        self.max_tokens = max(max_tokens, min_tokens)
+        self._tokens = float(min_tokens)
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts: int = 3,
+        methods=IDEMPOTENT_METHODS,
+        statuses=(429, 500, 502, 503, 504),
+        backoff: float = 0.1,
+        max_backoff: float = 5,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.attempts = attempts
+        self.methods = {method.upper() for method in methods}
+        self.statuses = set(statuses)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget or RetryBudget()
+
+    def idempotent(self, method: str) -> bool:
+        return method.upper() in self.methods
+
+    def retryable(self, method: str, response=None, error=None) -> bool:
+        if isinstance(error, CircuitBreakerOpenException):
+            return False
+        if isinstance(error, CONNECT_ERRORS):
+            return True
+        if not self.idempotent(method):
+            return False
+        if error is not None:
+            return True
+        return response.status in self.statuses
+
+    def should_retry(self, method: str, attempt: int, response=None, error=None):
+        if attempt + 1 >= self.attempts:
+            return False
+        if not self.retryable(method, response, error):
+            return False
+        return self.budget.withdraw()
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "trial_at")
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_at = None
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After ``threshold`` consecutive failures an endpoint is opened and
+    requests to it fail fast; once ``reset_timeout`` elapses a single
+    trial request is let through to close it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._circuits: dict = {}
+
+    def state(self, key: str) -> str:
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - circuit.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before(self, key: str) -> None:
+        state = self.state(key)
+        if state == self.CLOSED:
+            return
+        circuit = self._circuits[key]
+        now = time.monotonic()
+        if state == self.HALF_OPEN and (
+            circuit.trial_at is None or now - circuit.trial_at >= self.reset_timeout
+        ):
+            circuit.trial_at = now
+            return
+        raise CircuitBreakerOpenException(f"circuit for {key} is open")
+
+    def success(self, key: str) -> None:
+        self._circuits.pop(key, None)
+
+    def failure(self, key: str) -> None:
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        if circuit.opened_at is not None or circuit.failures >= self.threshold:
+            circuit.opened_at = time.monotonic()
+            circuit.trial_at = None
@@ -0,0 +1,171 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+from discovery import log
+from discovery.engine.deadline import remaining
+from discovery.exceptions import ClientOperationException, DeadlineExceededException
+from discovery.metrics import route_name
+
+
+class Watch:
+    """Async iterator over a Consul blocking query.
+
+    Each iteration yields the decoded body of ``fn`` once the
+    ``X-Consul-Index`` moves. With ``latest=True`` a background task
+    keeps polling and a slow consumer only sees the most recent value.
+    The requested wait is shortened to fit the current deadline, the
+    ``deadline`` kwarg and the engine ``timeout`` applied to each request.
+    """
+
+    def __init__(
+        self,
+        fn,
+        *args,
+        wait: float = 300,
+        jitter: float = 0.1,
+        backoff: float = 1,
+        max_backoff: float = 60,
+        latest: bool = False,
+        margin: float = 0.1,
+        timeout: Optional[float] = None,
+        instrumentation=None,
+        **kwargs,
+    ):
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self.wait = wait
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.latest = latest
+        self.margin = margin
+        self.timeout = timeout
+        self.instrumentation = instrumentation
+        name = getattr(fn, "name", None)
+        self._route = name if isinstance(name, str) else "unknown"
+        self.index = 0
+        self._failures = 0
+        self._closed = False
+        self._task = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._closed:
+            raise StopAsyncIteration
+        if not self.latest:
+            return await self._next_change()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        item = await self._queue.get()
+        if item is StopAsyncIteration:
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            self._closed = True
+            raise item
+        return item
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        await self.close()
+
+    async def close(self):
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._publish(StopAsyncIteration)
+
+    def _publish(self, item):
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    async def _run(self):
+        try:
+            while not self._closed:
+                self._publish(await self._next_change())
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            self._publish(err)
+
+    def _params(self):
+        params = dict(self._kwargs.get("params") or {})
+        if self.index > 0:
+            wait = self.wait * (1 - random.uniform(0, self.jitter))
+            budget = [
+                t
+                for t in (remaining(), self._kwargs.get("deadline"), self.timeout)
+                if t
+            ]
+            if budget:
+                # Consul may add up to wait/16 to the requested wait.
+                wait = min(wait, (min(budget) - self.margin) / 1.0625)
+                if wait <= 0:
+                    raise DeadlineExceededException("no time left to wait")
+            params.update(index=self.index, wait=f"{int(wait * 1000)}ms")
+        return params
+
+    def _sleep_interval(self):
+        interval = min(self.max_backoff, self.backoff * 2**self._failures)
+        return random.uniform(interval / 2, interval)
+
+    def _update_index(self, response):
+        try:
+            index = int(response.headers["X-Consul-Index"])
+        except (KeyError, TypeError, ValueError):
+            raise ClientOperationException(
+                f"{response.url} does not support blocking queries"
+            )
+        if index < self.index:
+            log.debug(f"Consul index went backwards ({self.index} > {index})")
+        index = max(index, 1)
+        changed = index != self.index
+        self.index = index
+        return changed
+
+    async def _next_change(self):
+        while not self._closed:
+            kwargs = dict(self._kwargs, params=self._params())
+            start = time.monotonic()
+            try:
+                response = await self._fn(*self._args, **kwargs)
+            except (asyncio.CancelledError, DeadlineExceededException):
+                raise
+            except Exception as err:
+                await self._on_failure(err)
+                continue
+            if self.instrumentation is not None and self._route == "unknown":
+                self._route = route_name("GET", response.url)
+            if response.status != 200:
+                await self._on_failure(f"status {response.status}")
+                continue
+            changed = self._update_index(response)
+            if self.instrumentation is not None:
+                if "index" in kwargs["params"]:
+                    elapsed = time.monotonic() - start
+                    self.instrumentation.watch_wait(self._route, elapsed)
+                self.instrumentation.watch_contact(self._route, self.index)
+            self._failures = 0
+            if changed:
+                return await response.json()
+        raise StopAsyncIteration
+
+    async def _on_failure(self, err):
+        if self.instrumentation is not None:
+            self.instrumentation.watch_error(self._route)
+        self._failures += 1
+        log.warning(f"blocking query failed: {err}")
+        await asyncio.sleep(self._sleep_interval())
@@ -8,3 +8,11 @@ class ClientOperationException(Exception):
 
 class NoConsulLeaderException(Exception):
     pass
+
+
+class CircuitBreakerOpenException(ClientOperationException):
+    pass
+
+
+class DeadlineExceededException(ClientOperationException):
+    pass
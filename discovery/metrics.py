@@ -0,0 +1,235 @@
+import abc
+import bisect
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import urlsplit
+
+from discovery import log
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    300,
+)
+
+KV_ROUTES = {"GET": "kv.read", "PUT": "kv.write", "DELETE": "kv.delete"}
+
+current_route: "ContextVar[Optional[str]]" = ContextVar("current_route", default=None)
+
+
+def route_name(method: str, url: str) -> str:
+    """Logical route for a request, e.g. ``health.service``.
+
+    Calls made through a declared :class:`~discovery.api.route.Route` use its
+    name; other requests fall back to a best effort guess from the URL.
+    """
+    route = current_route.get()
+    if route is not None:
+        return route
+    path = urlsplit(url).path.split("/v1/", 1)[-1]
+    segments = [s for s in path.split("/") if s]
+    if not segments:
+        return "unknown"
+    if segments[0] == "kv":
+        return KV_ROUTES.get(method, f"kv.{method.lower()}")
+    return ".".join(segments[:2])
+
+
+def _key(labels):
+    if not labels:
+        return ()
+    return tuple(sorted(labels.items()))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return float(bound)
+        return float("inf")
+
+
+class Sink(abc.ABC):
+    @abc.abstractmethod
+    def inc(self, name: str, value: float = 1, labels: Optional[dict] = None) -> None:
+        pass
+
+    @abc.abstractmethod
+    def add(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        pass
+
+    @abc.abstractmethod
+    def set(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        pass
+
+    @abc.abstractmethod
+    def observe(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        pass
+
+
+class MetricsRegistry(Sink):
+    """In-memory counters, gauges and histograms keyed by name and labels."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters: dict = defaultdict(lambda: defaultdict(float))
+        self.gauges: dict = defaultdict(lambda: defaultdict(float))
+        self.histograms: dict = defaultdict(dict)
+
+    def inc(self, name, value=1, labels=None):
+        self.counters[name][_key(labels)] += value
+
+    def add(self, name, value, labels=None):
+        self.gauges[name][_key(labels)] += value
+
+    def set(self, name, value, labels=None):
+        self.gauges[name][_key(labels)] = value
+
+    def observe(self, name, value, labels=None):
+        series = self.histograms[name]
+        key = _key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def counter(self, name, **labels) -> float:
+        return float(self.counters[name].get(_key(labels), 0))
+
+    def gauge(self, name, **labels) -> float:
+        return float(self.gauges[name].get(_key(labels), 0))
+
+    def histogram(self, name, **labels):
+        return self.histograms[name].get(_key(labels))
+
+
+class LoggingSink(Sink):
+    def __init__(self, logger=log):
+        self.logger = logger
+
+    def inc(self, name, value=1, labels=None):
+        self.logger.debug(f"{name}{labels or ''} += {value}")
+
+    def add(self, name, value, labels=None):
+        self.logger.debug(f"{name}{labels or ''} += {value}")
+
+    def set(self, name, value, labels=None):
+        self.logger.debug(f"{name}{labels or ''} = {value}")
+
+    def observe(self, name, value, labels=None):
+        self.logger.debug(f"{name}{labels or ''} <- {value}")
+
+
+class Instrumentation:
+    """Fan client events out to one or more sinks.
+
+    Engines, caches and watches only call into it when one is configured,
+    so leaving it unset costs a single ``is None`` check per request.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks) or [MetricsRegistry()]
+
+    @property
+    def registry(self):
+        return next((s for s in self.sinks if isinstance(s, MetricsRegistry)), None)
+
+    def inc(self, name, value=1, labels=None):
+        for sink in self.sinks:
+            sink.inc(name, value, labels)
+
+    def add(self, name, value, labels=None):
+        for sink in self.sinks:
+            sink.add(name, value, labels)
+
+    def set(self, name, value, labels=None):
+        for sink in self.sinks:
+            sink.set(name, value, labels)
+
+    def observe(self, name, value, labels=None):
+        for sink in self.sinks:
+            sink.observe(name, value, labels)
+
+    def request_started(self, route: str, method: str, data=None) -> float:
+        self.add("discovery_requests_in_flight", 1, {"route": route})
+        if isinstance(data, (bytes, bytearray, str)):
+            self.inc("discovery_request_bytes_total", len(data), {"route": route})
+        return time.monotonic()
+
+    def request_finished(self, route: str, method: str, start: float, response=None):
+        labels = {"route": route}
+        self.add("discovery_requests_in_flight", -1, labels)
+        self.observe(
+            "discovery_request_duration_seconds",
+            time.monotonic() - start,
+            {"route": route, "method": method},
+        )
+        status = "error" if response is None else str(response.status)
+        self.inc("discovery_responses_total", 1, {"route": route, "status": status})
+
+    def response_bytes(self, route: str, size: int) -> None:
+        self.inc("discovery_response_bytes_total", size, {"route": route})
+
+    def retry(self, route: str) -> None:
+        self.inc("discovery_retries_total", 1, {"route": route})
+
+    def cache(self, result: str) -> None:
+        self.inc("discovery_cache_requests_total", 1, {"result": result})
+
+    def watch_wait(self, route: str, seconds: float) -> None:
+        self.observe("discovery_watch_wait_seconds", seconds, {"route": route})
+
+    def watch_contact(self, route: str, index: int) -> None:
+        labels = {"route": route}
+        self.set("discovery_watch_index", index, labels)
+        self.set("discovery_watch_last_contact_timestamp_seconds", time.time(), labels)
+
+    def watch_error(self, route: str) -> None:
+        self.inc("discovery_watch_errors_total", 1, {"route": route})
+
+    def pick(self, service: str, instance: str) -> None:
+        labels = {"service": service, "instance": instance}
+        self.inc("discovery_balancer_picks_total", 1, labels)
+
+    def task_health(self, task: str, up: bool) -> None:
+        self.set("discovery_background_task_up", 1 if up else 0, {"task": task})
+        if not up:
+            self.inc("discovery_background_task_failures_total", 1, {"task": task})
@@ -0,0 +1,102 @@
+import time
+
+from discovery.metrics import MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HELP = {
+    "discovery_request_duration_seconds": "Latency of requests sent to Consul.",
+    "discovery_requests_in_flight": "Requests to Consul currently in flight.",
+    "discovery_responses_total": "Responses received from Consul by status.",
+    "discovery_request_bytes_total": "Bytes sent to Consul.",
+    "discovery_response_bytes_total": "Bytes received from Consul.",
+    "discovery_retries_total": "Requests retried by the engine.",
+    "discovery_cache_requests_total": "Service cache lookups by result.",
+    "discovery_cache_hit_ratio": "Share of service cache lookups served from cache.",
+    "discovery_cache_watches_active": "Blocking queries keeping cache entries fresh.",
+    "discovery_watch_wait_seconds": "Time blocking queries waited for a change.",
+    "discovery_watch_index": "Last X-Consul-Index seen by a watch.",
+    "discovery_watch_last_contact_timestamp_seconds": "Last successful watch reply.",
+    "discovery_watch_lag_seconds": "Seconds since a watch last heard from Consul.",
+    "discovery_watch_errors_total": "Failed blocking queries.",
+    "discovery_balancer_picks_total": "Instances picked by the load balancer.",
+    "discovery_background_task_up": "Whether a background task last succeeded.",
+    "discovery_background_task_failures_total": "Background task failures.",
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key, extra=()) -> str:
+    pairs = tuple(key) + tuple(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _header(lines, name, kind):
+    lines.append(f"# HELP {name} {HELP.get(name, name)}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _derived(registry: MetricsRegistry):
+    gauges = {}
+    cache = registry.counters.get("discovery_cache_requests_total", {})
+    total = sum(cache.values())
+    if total:
+        hits = sum(v for k, v in cache.items() if ("result", "miss") not in k)
+        gauges["discovery_cache_hit_ratio"] = {(): hits / total}
+    contacts = registry.gauges.get("discovery_watch_last_contact_timestamp_seconds")
+    if contacts:
+        now = time.time()
+        gauges["discovery_watch_lag_seconds"] = {
+            key: max(0.0, now - value) for key, value in contacts.items()
+        }
+    return gauges
+
+
+def render(registry: MetricsRegistry) -> str:
+    """Render a registry in the Prometheus text exposition format."""
+    lines: list = []
+    for name, series in sorted(registry.counters.items()):
+        _header(lines, name, "counter")
+        for key, value in sorted(series.items()):
+            lines.append(f"{name}{_labels(key)} {_number(value)}")
+    gauges = dict(registry.gauges)
+    gauges.update(_derived(registry))
+    for name, series in sorted(gauges.items()):
+        _header(lines, name, "gauge")
+        for key, value in sorted(series.items()):
+            lines.append(f"{name}{_labels(key)} {_number(value)}")
+    for name, series in sorted(registry.histograms.items()):
+        _header(lines, name, "histogram")
+        for key, histogram in sorted(series.items()):
+            for bound, total in histogram.cumulative():
+                le = (("le", _number(bound)),)
+                lines.append(f"{name}_bucket{_labels(key, le)} {total}")
+            lines.append(f"{name}_sum{_labels(key)} {_number(histogram.sum)}")
+            lines.append(f"{name}_count{_labels(key)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_handler(registry: MetricsRegistry):
+    """aiohttp handler serving ``registry`` to a Prometheus scraper."""
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(
+            body=render(registry).encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    return handler
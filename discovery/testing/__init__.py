@@ -0,0 +1,4 @@
+from discovery.testing.server import FakeConsul, parse_wait
+from discovery.testing.state import ConsulState
+
+__all__ = ["ConsulState", "FakeConsul", "parse_wait"]
@@ -0,0 +1,435 @@
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Optional
+
+from aiohttp import web
+
+from discovery.testing.state import (
+    CHECK_STATES,
+    CRITICAL,
+    PASSING,
+    ConsulState,
+    encode,
+    field,
+)
+
+MAX_WAIT = 600
+DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|h)?$")
+UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def parse_wait(value: str, default: float = 300) -> float:
+    """Parse a Consul duration such as ``10s`` or ``5m`` capped at 10 minutes."""
+    match = DURATION.match(value or "")
+    if not match:
+        return default
+    number, unit = match.groups()
+    return min(MAX_WAIT, float(number) * UNITS[unit])
+
+
+def _int(request, name, default=None):
+    value = request.query.get(name)
+    return default if value is None else int(value)
+
+
+def _flag(request, name) -> bool:
+    return name in request.query and request.query[name] not in ("false", "0")
+
+
+async def _body(request):
+    data = await request.read()
+    if not data:
+        return {}
+    return json.loads(data)
+
+
+class FakeConsul:
+    """In-process Consul HTTP API for tests and benchmarks.
+
+    Implements the catalog, health, kv, txn, session, agent service/check
+    and status endpoints on top of :class:`ConsulState`, including blocking
+    queries (``index``/``wait``), per-request ``latency`` plus uniform
+    ``jitter`` and leader elections through :meth:`elect` and
+    :meth:`step_down`.
+    """
+
+    def __init__(self, latency: float = 0, jitter: float = 0, state=None, **kwargs):
+        self.latency = latency
+        self.jitter = jitter
+        self.state = state or ConsulState(**kwargs)
+        self.requests = 0
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes(self.routes())
+        self._runner: Optional[web.AppRunner] = None
+        self.host: Optional[str] = None
+        self.port: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"FakeConsul(url={self.url})"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        runner = self._runner = web.AppRunner(self.app)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        self.host = host
+        self.port = runner.addresses[0][1]
+        return self
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def elect(self, leader: Optional[str] = None) -> str:
+        return self.state.elect(leader)
+
+    def step_down(self) -> None:
+        self.state.step_down()
+
+    def routes(self):
+        return [
+            web.get("/v1/status/leader", self.status_leader),
+            web.get("/v1/status/peers", self.status_peers),
+            web.get("/v1/catalog/datacenters", self.catalog_datacenters),
+            web.get("/v1/catalog/nodes", self.catalog_nodes),
+            web.get("/v1/catalog/services", self.catalog_services),
+            web.get("/v1/catalog/service/{name}", self.catalog_service),
+            web.get("/v1/catalog/node/{node}", self.catalog_node),
+            web.put("/v1/catalog/register", self.catalog_register),
+            web.put("/v1/catalog/deregister", self.catalog_deregister),
+            web.get("/v1/health/service/{name}", self.health_service),
+            web.get("/v1/health/checks/{name}", self.health_checks),
+            web.get("/v1/health/node/{node}", self.health_node),
+            web.get("/v1/health/state/{state}", self.health_state),
+            web.get("/v1/kv/{key:.*}", self.kv_get),
+            web.put("/v1/kv/{key:.*}", self.kv_put),
+            web.delete("/v1/kv/{key:.*}", self.kv_delete),
+            web.put("/v1/txn", self.txn),
+            web.put("/v1/session/create", self.session_create),
+            web.put("/v1/session/destroy/{id}", self.session_destroy),
+            web.get("/v1/session/info/{id}", self.session_info),
+            web.get("/v1/session/node/{node}", self.session_node),
+            web.get("/v1/session/list", self.session_list),
+            web.put("/v1/session/renew/{id}", self.session_renew),
+            web.get("/v1/agent/self", self.agent_self),
+            web.get("/v1/agent/services", self.agent_services),
+            web.get("/v1/agent/service/{id}", self.agent_service),
+            web.put("/v1/agent/service/register", self.agent_service_register),
+            web.put("/v1/agent/service/deregister/{id}", self.agent_service_deregister),
+            web.get("/v1/agent/checks", self.agent_checks),
+            web.put("/v1/agent/check/register", self.agent_check_register),
+            web.put("/v1/agent/check/deregister/{id}", self.agent_check_deregister),
+            web.put("/v1/agent/check/pass/{id}", self.agent_check_ttl),
+            web.put("/v1/agent/check/warn/{id}", self.agent_check_ttl),
+            web.put("/v1/agent/check/fail/{id}", self.agent_check_ttl),
+            web.put("/v1/agent/check/update/{id}", self.agent_check_update),
+        ]
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        self.requests += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.state.leader is None and not request.path.startswith(
+            ("/v1/status/", "/v1/agent/")
+        ):
+            return web.Response(status=500, text="No cluster leader")
+        try:
+            return await handler(request)
+        except (ValueError, KeyError) as err:
+            return web.Response(status=400, text=str(err))
+
+    def _json(self, data, index=None, status=200):
+        headers = {
+            "X-Consul-KnownLeader": str(self.state.leader is not None).lower(),
+            "X-Consul-LastContact": "0",
+        }
+        if index is not None:
+            headers["X-Consul-Index"] = str(index)
+        return web.json_response(data, status=status, headers=headers)
+
+    async def _blocking(self, request, query):
+        index = _int(request, "index", 0)
+        wait = parse_wait(request.query.get("wait"))
+        if index:
+            wait += random.uniform(0, wait / 16)
+        return await self.state.block(index, wait, query)
+
+    # status
+
+    async def status_leader(self, request):
+        leader = self.state.leader or ""
+        return self._json(leader)
+
+    async def status_peers(self, request):
+        return self._json(self.state.peers)
+
+    # catalog
+
+    async def catalog_datacenters(self, request):
+        return self._json([self.state.datacenter])
+
+    async def catalog_nodes(self, request):
+        index, nodes = await self._blocking(
+            request,
+            lambda: (self.state.table_index("nodes"), list(self.state.nodes.values())),
+        )
+        return self._json(nodes, index)
+
+    async def catalog_services(self, request):
+        def query():
+            services: dict = {}
+            for service in self.state.services.values():
+                tags = services.setdefault(service["Service"], [])
+                tags.extend(t for t in service["Tags"] if t not in tags)
+            return self.state.table_index("services"), services
+
+        index, services = await self._blocking(request, query)
+        return self._json(services, index)
+
+    async def catalog_service(self, request):
+        name, tag = request.match_info["name"], request.query.get("tag")
+        index, entries = await self._blocking(
+            request, lambda: self.state.catalog_service(name, tag)
+        )
+        return self._json(entries, index)
+
+    async def catalog_node(self, request):
+        name = request.match_info["node"]
+
+        def query():
+            node = self.state.nodes.get(name)
+            if node is None:
+                return self.state.table_index("nodes"), None
+            services = {
+                sid: service
+                for (n, sid), service in self.state.services.items()
+                if n == name
+            }
+            return node["ModifyIndex"], {"Node": node, "Services": services}
+
+        index, result = await self._blocking(request, query)
+        return self._json(result, index)
+
+    async def catalog_register(self, request):
+        return self._json(self.state.register(await _body(request)))
+
+    async def catalog_deregister(self, request):
+        data = await _body(request)
+        result = self.state.deregister(
+            field(data, "Node"), field(data, "ServiceID"), field(data, "CheckID")
+        )
+        return self._json(result)
+
+    # health
+
+    async def health_service(self, request):
+        name, tag = request.match_info["name"], request.query.get("tag")
+        passing = _flag(request, "passing")
+        index, entries = await self._blocking(
+            request, lambda: self.state.health_service(name, tag, passing)
+        )
+        return self._json(entries, index)
+
+    async def _checks(self, request, predicate):
+        def query():
+            checks = [c for c in self.state.checks.values() if predicate(c)]
+            return self.state.table_index("checks"), checks
+
+        index, checks = await self._blocking(request, query)
+        return self._json(checks, index)
+
+    async def health_checks(self, request):
+        name = request.match_info["name"]
+        return await self._checks(request, lambda c: c["ServiceName"] == name)
+
+    async def health_node(self, request):
+        node = request.match_info["node"]
+        return await self._checks(request, lambda c: c["Node"] == node)
+
+    async def health_state(self, request):
+        state = request.match_info["state"]
+        if state != "any" and state not in CHECK_STATES:
+            raise ValueError(f"invalid state {state}")
+        return await self._checks(request, lambda c: state in ("any", c["Status"]))
+
+    # kv
+
+    async def kv_get(self, request):
+        key = request.match_info["key"]
+        if "keys" in request.query:
+            separator = request.query.get("separator")
+            index, keys = await self._blocking(
+                request, lambda: self.state.kv_keys(key, separator)
+            )
+            return self._json(keys, index, 200 if keys else 404)
+        recurse = _flag(request, "recurse")
+        index, entries = await self._blocking(
+            request, lambda: self.state.kv_get(key, recurse)
+        )
+        if not entries:
+            return self._json(None, index, 404)
+        if "raw" in request.query:
+            return web.Response(
+                body=entries[0]["Value"] or b"", headers={"X-Consul-Index": str(index)}
+            )
+        return self._json([dict(e, Value=encode(e["Value"])) for e in entries], index)
+
+    async def kv_put(self, request):
+        result = self.state.kv_put(
+            request.match_info["key"],
+            await request.read(),
+            flags=_int(request, "flags", 0),
+            cas=_int(request, "cas"),
+            acquire=request.query.get("acquire"),
+            release=request.query.get("release"),
+        )
+        return self._json(result)
+
+    async def kv_delete(self, request):
+        result = self.state.kv_delete(
+            request.match_info["key"],
+            recurse=_flag(request, "recurse"),
+            cas=_int(request, "cas"),
+        )
+        return self._json(result)
+
+    async def txn(self, request):
+        results, errors = self.state.txn(await _body(request))
+        status = 409 if errors else 200
+        return self._json(
+            {"Results": results, "Errors": errors}, self.state.index, status
+        )
+
+    # session
+
+    async def session_create(self, request):
+        return self._json({"ID": self.state.session_create(await _body(request))})
+
+    async def session_destroy(self, request):
+        return self._json(self.state.session_destroy(request.match_info["id"]))
+
+    async def _sessions(self, request, predicate):
+        def query():
+            sessions = [s for s in self.state.sessions.values() if predicate(s)]
+            return self.state.table_index("sessions"), sessions
+
+        index, sessions = await self._blocking(request, query)
+        return self._json(sessions, index)
+
+    async def session_info(self, request):
+        session_id = request.match_info["id"]
+        return await self._sessions(request, lambda s: s["ID"] == session_id)
+
+    async def session_node(self, request):
+        node = request.match_info["node"]
+        return await self._sessions(request, lambda s: s["Node"] == node)
+
+    async def session_list(self, request):
+        return await self._sessions(request, lambda s: True)
+
+    async def session_renew(self, request):
+        session = self.state.sessions.get(request.match_info["id"])
+        if session is None:
+            return web.Response(status=404, text="Session id not found")
+        return self._json([session], self.state.table_index("sessions"))
+
+    # agent
+
+    async def agent_self(self, request):
+        node = self.state.nodes.get(self.state.node, {})
+        return self._json(
+            {
+                "Config": {
+                    "Datacenter": self.state.datacenter,
+                    "NodeName": self.state.node,
+                    "NodeID": node.get("ID", ""),
+                    "Server": True,
+                },
+                "Member": {"Name": self.state.node, "Addr": node.get("Address", "")},
+                "Meta": {},
+                "Stats": {"raft": {"last_contact": time.monotonic()}},
+            }
+        )
+
+    def _local(self, table):
+        return {
+            key[1]: value for key, value in table.items() if key[0] == self.state.node
+        }
+
+    async def agent_services(self, request):
+        services = {
+            sid: dict(service, Datacenter=self.state.datacenter)
+            for sid, service in self._local(self.state.services).items()
+        }
+        return self._json(services)
+
+    async def agent_service(self, request):
+        service = self._local(self.state.services).get(request.match_info["id"])
+        if service is None:
+            return web.Response(status=404, text="unknown service ID")
+        return self._json(service, service["ModifyIndex"])
+
+    async def agent_service_register(self, request):
+        data = await _body(request)
+        if not field(data, "Name"):
+            raise ValueError("Missing service name")
+        self.state.commit("services", "checks")
+        service = self.state.register_service(self.state.node, data)
+        checks = list(field(data, "Checks") or [])
+        if field(data, "Check"):
+            checks.append(field(data, "Check"))
+        for check in checks:
+            self.state.register_check(self.state.node, check, service)
+        return web.Response()
+
+    async def agent_service_deregister(self, request):
+        self.state.deregister(self.state.node, service_id=request.match_info["id"])
+        return web.Response()
+
+    async def agent_checks(self, request):
+        return self._json(self._local(self.state.checks))
+
+    async def agent_check_register(self, request):
+        self.state.commit("checks")
+        self.state.register_check(self.state.node, await _body(request))
+        return web.Response()
+
+    async def agent_check_deregister(self, request):
+        self.state.deregister(self.state.node, check_id=request.match_info["id"])
+        return web.Response()
+
+    async def agent_check_ttl(self, request):
+        verb = request.path.rsplit("/", 2)[-2]
+        status = {"pass": PASSING, "warn": "warning", "fail": CRITICAL}[verb]
+        output = request.query.get("note") or (await request.text()) or None
+        return self._check_update(request.match_info["id"], status, output)
+
+    async def agent_check_update(self, request):
+        data = await _body(request)
+        status = field(data, "Status", CRITICAL)
+        if status not in CHECK_STATES:
+            raise ValueError(f"invalid check status {status}")
+        return self._check_update(
+            request.match_info["id"], status, field(data, "Output")
+        )
+
+    def _check_update(self, check_id, status, output):
+        if not self.state.update_check(self.state.node, check_id, status, output):
+            return web.Response(status=404, text=f"CheckID {check_id!r} does not exist")
+        return web.Response()
@@ -0,0 +1,423 @@
+import asyncio
+import base64
+import time
+import uuid
+from typing import Dict, Optional
+
+PASSING = "passing"
+WARNING = "warning"
+CRITICAL = "critical"
+CHECK_STATES = (PASSING, WARNING, CRITICAL)
+
+
+def field(data: dict, name: str, default=None):
+    """Read ``name`` accepting Consul's PascalCase and the lowercase form."""
+    for key in (name, name.lower(), name[0].lower() + name[1:]):
+        if key in data:
+            return data[key]
+    return default
+
+
+def encode(value) -> Optional[str]:
+    if value is None:
+        return None
+    return base64.b64encode(value).decode("ascii")
+
+
+class ConsulState:
+    """Raft-like store backing the fake Consul server.
+
+    Every write commits under a new, monotonically increasing raft index
+    which is also stamped on the tables it touched, so blocking queries
+    only wake up when something they depend on was modified.
+    """
+
+    def __init__(self, datacenter: str = "dc1", servers: int = 3) -> None:
+        self.datacenter = datacenter
+        self.index = 0
+        self.tables: Dict[str, int] = {}
+        self.kv: dict = {}
+        self.nodes: dict = {}
+        self.services: dict = {}
+        self.checks: dict = {}
+        self.sessions: dict = {}
+        self.peers = [f"10.0.0.{n}:8300" for n in range(1, servers + 1)]
+        self.leader = self.peers[0] if self.peers else None
+        self.last_contact = time.monotonic()
+        self._changed: Optional[asyncio.Event] = None
+        for n, peer in enumerate(self.peers, start=1):
+            address, _ = peer.split(":")
+            self.register(
+                {
+                    "Node": f"consul-{n}",
+                    "Address": address,
+                    "Service": {"ID": "consul", "Service": "consul", "Port": 8300},
+                }
+            )
+
+    @property
+    def node(self) -> str:
+        """Name of the node running the local agent."""
+        return next(iter(self.nodes), "consul-1")
+
+    def table_index(self, *tables) -> int:
+        return max(1, max((self.tables.get(t, 0) for t in tables), default=0))
+
+    def commit(self, *tables) -> int:
+        self.index += 1
+        for table in tables:
+            self.tables[table] = self.index
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+        return self.index
+
+    async def block(self, index: int, wait: float, query):
+        """Run ``query`` until its index moves past ``index`` or ``wait`` ends.
+
+        ``query`` returns ``(index, result)``; like Consul the returned index
+        is never below 1.
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + wait
+        while True:
+            result_index, result = query()
+            result_index = max(1, result_index)
+            remaining = deadline - loop.time()
+            if not index or result_index > index or remaining <= 0:
+                return result_index, result
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    # leadership
+
+    def elect(self, leader: Optional[str] = None) -> str:
+        if leader is None:
+            current = self.peers.index(self.leader) if self.leader in self.peers else -1
+            leader = self.peers[(current + 1) % len(self.peers)]
+        if leader not in self.peers:
+            raise ValueError(f"{leader} is not a raft peer")
+        self.leader = leader
+        self.last_contact = time.monotonic()
+        return leader
+
+    def step_down(self) -> None:
+        self.leader = None
+
+    # kv
+
+    def _kv_entry(self, key, value, flags=0, entry=None):
+        index = self.index
+        if entry is None:
+            entry = {"Key": key, "CreateIndex": index, "LockIndex": 0}
+        entry.update(Value=value, Flags=int(flags), ModifyIndex=index)
+        return entry
+
+    def kv_get(self, key, recurse=False):
+        if recurse:
+            entries = [self.kv[k] for k in sorted(self.kv) if k.startswith(key)]
+        else:
+            entries = [self.kv[key]] if key in self.kv else []
+        index = max((e["ModifyIndex"] for e in entries), default=0)
+        return index or self.table_index("kvs"), entries
+
+    def kv_keys(self, prefix, separator=None):
+        keys = set()
+        for key in self.kv:
+            if not key.startswith(prefix):
+                continue
+            if separator:
+                position = key.find(separator, len(prefix))
+                if position >= 0:
+                    key = key[: position + len(separator)]
+            keys.add(key)
+        return self.table_index("kvs"), sorted(keys)
+
+    def kv_put(self, key, value, flags=0, cas=None, acquire=None, release=None):
+        entry = self.kv.get(key)
+        if cas is not None:
+            if (cas == 0 and entry is not None) or (
+                cas != 0 and (entry is None or entry["ModifyIndex"] != cas)
+            ):
+                return False
+        if acquire is not None:
+            if acquire not in self.sessions:
+                raise KeyError(f"invalid session {acquire}")
+            if entry is not None and entry.get("Session") not in (None, acquire):
+                return False
+        if release is not None:
+            if entry is None or entry.get("Session") != release:
+                return False
+        self.commit("kvs")
+        entry = self._kv_entry(key, value, flags, entry)
+        if acquire is not None and entry.get("Session") != acquire:
+            entry["Session"] = acquire
+            entry["LockIndex"] += 1
+        if release is not None:
+            entry.pop("Session", None)
+        self.kv[key] = entry
+        return True
+
+    def kv_delete(self, key, recurse=False, cas=None):
+        entry = self.kv.get(key)
+        if cas is not None and (entry is None or entry["ModifyIndex"] != cas):
+            return False
+        keys = [k for k in self.kv if k.startswith(key)] if recurse else [key]
+        self.commit("kvs")
+        for k in keys:
+            self.kv.pop(k, None)
+        return True
+
+    def txn(self, operations):
+        """Apply KV operations atomically, returning ``(results, errors)``."""
+        kv = {k: dict(v) for k, v in self.kv.items()}
+        index = self.index + 1
+        results, errors = [], []
+        for position, operation in enumerate(operations):
+            op = field(operation, "KV")
+            if op is None:
+                errors.append({"OpIndex": position, "What": "unsupported operation"})
+                continue
+            verb = field(op, "Verb")
+            key = field(op, "Key", "")
+            entry = kv.get(key)
+            value = field(op, "Value")
+            value = base64.b64decode(value) if value is not None else None
+            expected = field(op, "Index", 0)
+            error = None
+            if verb in ("set", "cas"):
+                if verb == "cas" and (entry or {}).get("ModifyIndex", 0) != expected:
+                    error = f"failed to set key {key!r}, index is stale"
+                else:
+                    if entry is None:
+                        entry = {"Key": key, "CreateIndex": index, "LockIndex": 0}
+                    entry.update(
+                        Value=value, Flags=field(op, "Flags", 0), ModifyIndex=index
+                    )
+                    kv[key] = entry
+                    results.append({"KV": self._txn_view(entry)})
+            elif verb == "get":
+                if entry is None:
+                    error = f"key {key!r} doesn't exist"
+                else:
+                    results.append({"KV": dict(entry, Value=encode(entry["Value"]))})
+            elif verb == "get-tree":
+                for k in sorted(kv):
+                    if k.startswith(key):
+                        value = encode(kv[k]["Value"])
+                        results.append({"KV": dict(kv[k], Value=value)})
+            elif verb == "check-index":
+                if entry is None or entry["ModifyIndex"] != expected:
+                    error = f"current modify index for key {key!r} does not match"
+                else:
+                    results.append({"KV": self._txn_view(entry)})
+            elif verb == "check-not-exists":
+                if entry is not None:
+                    error = f"key {key!r} exists"
+            elif verb == "delete":
+                kv.pop(key, None)
+            elif verb == "delete-tree":
+                for k in [k for k in kv if k.startswith(key)]:
+                    kv.pop(k)
+            elif verb == "delete-cas":
+                if entry is None or entry["ModifyIndex"] != expected:
+                    error = f"failed to delete key {key!r}, index is stale"
+                else:
+                    kv.pop(key)
+            else:
+                error = f"unknown KV verb {verb!r}"
+            if error:
+                errors.append({"OpIndex": position, "What": error})
+        if errors:
+            return None, errors
+        if kv != self.kv:
+            self.commit("kvs")
+            self.kv = kv
+        return results, None
+
+    @staticmethod
+    def _txn_view(entry):
+        return dict(entry, Value=None)
+
+    # sessions
+
+    def session_create(self, data):
+        session_id = str(uuid.uuid4())
+        index = self.commit("sessions")
+        self.sessions[session_id] = {
+            "ID": session_id,
+            "Name": field(data, "Name", ""),
+            "Node": field(data, "Node") or self.node,
+            "LockDelay": field(data, "LockDelay", 15000000000),
+            "Behavior": field(data, "Behavior", "release"),
+            "TTL": field(data, "TTL", ""),
+            "Checks": field(data, "Checks", ["serfHealth"]),
+            "CreateIndex": index,
+            "ModifyIndex": index,
+        }
+        return session_id
+
+    def session_destroy(self, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self.commit("sessions", "kvs")
+        for key, entry in list(self.kv.items()):
+            if entry.get("Session") != session_id:
+                continue
+            if session["Behavior"] == "delete":
+                del self.kv[key]
+            else:
+                entry.pop("Session")
+                entry["ModifyIndex"] = self.index
+        return True
+
+    # catalog
+
+    def register(self, data):
+        name = field(data, "Node")
+        node = self.nodes.get(name)
+        index = self.commit("nodes", "services", "checks")
+        if node is None:
+            node = self.nodes[name] = {
+                "ID": str(uuid.uuid5(uuid.NAMESPACE_DNS, name)),
+                "Node": name,
+                "CreateIndex": index,
+                "Datacenter": self.datacenter,
+            }
+            self.checks[(name, "serfHealth")] = self._check(
+                name, {"CheckID": "serfHealth", "Name": "Serf Health Status"}, PASSING
+            )
+        node.update(
+            Address=field(data, "Address", node.get("Address", "127.0.0.1")),
+            TaggedAddresses=field(data, "TaggedAddresses", {}),
+            Meta=field(data, "NodeMeta", {}),
+            ModifyIndex=index,
+        )
+        service = field(data, "Service")
+        if service:
+            self.register_service(name, service)
+        checks = field(data, "Checks") or []
+        if field(data, "Check"):
+            checks.append(field(data, "Check"))
+        for check in checks:
+            self.register_check(name, check)
+        return True
+
+    def register_service(self, node, data):
+        index = self.index
+        service_id = field(data, "ID") or field(data, "Service") or field(data, "Name")
+        existing = self.services.get((node, service_id))
+        service = {
+            "ID": service_id,
+            "Service": field(data, "Service") or field(data, "Name"),
+            "Tags": field(data, "Tags") or [],
+            "Address": field(data, "Address", ""),
+            "Meta": field(data, "Meta") or {},
+            "Port": int(field(data, "Port", 0)),
+            "Weights": field(data, "Weights") or {"Passing": 1, "Warning": 1},
+            "EnableTagOverride": field(data, "EnableTagOverride", False),
+            "CreateIndex": existing["CreateIndex"] if existing else index,
+            "ModifyIndex": index,
+        }
+        self.services[(node, service_id)] = service
+        return service
+
+    def register_check(self, node, data, service=None):
+        status = field(data, "Status", CRITICAL)
+        check = self._check(node, data, status, service)
+        self.checks[(node, check["CheckID"])] = check
+        return check
+
+    def _check(self, node, data, status, service=None):
+        service_id = field(data, "ServiceID", service["ID"] if service else "")
+        service = service or self.services.get((node, service_id)) or {}
+        check_id = field(data, "CheckID") or field(data, "ID") or field(data, "Name")
+        if not check_id:
+            check_id = f"service:{service_id}" if service_id else str(uuid.uuid4())
+        return {
+            "Node": node,
+            "CheckID": check_id,
+            "Name": field(data, "Name") or check_id,
+            "Status": status,
+            "Notes": field(data, "Notes", ""),
+            "Output": field(data, "Output", ""),
+            "ServiceID": service_id,
+            "ServiceName": service.get("Service", ""),
+            "ServiceTags": service.get("Tags", []),
+            "Type": "ttl" if field(data, "TTL") else "",
+            "Definition": {},
+            "CreateIndex": self.index,
+            "ModifyIndex": self.index,
+        }
+
+    def deregister(self, node, service_id=None, check_id=None):
+        if node not in self.nodes:
+            return False
+        self.commit("nodes", "services", "checks")
+        if service_id is None and check_id is None:
+            del self.nodes[node]
+            for table in (self.services, self.checks):
+                for key in [k for k in table if k[0] == node]:
+                    del table[key]
+        if service_id is not None:
+            self.services.pop((node, service_id), None)
+            for key, check in list(self.checks.items()):
+                if key[0] == node and check["ServiceID"] == service_id:
+                    del self.checks[key]
+        if check_id is not None:
+            self.checks.pop((node, check_id), None)
+        return True
+
+    def update_check(self, node, check_id, status, output=None):
+        check = self.checks.get((node, check_id))
+        if check is None:
+            return False
+        index = self.commit("checks")
+        check.update(Status=status, ModifyIndex=index)
+        if output is not None:
+            check["Output"] = output
+        return True
+
+    def catalog_service(self, name, tag=None):
+        entries = []
+        for (node, _), service in sorted(self.services.items()):
+            if service["Service"] != name or (tag and tag not in service["Tags"]):
+                continue
+            entry = dict(self.nodes[node], NodeMeta=self.nodes[node]["Meta"])
+            entry.pop("Meta")
+            entry.update(
+                ServiceID=service["ID"],
+                ServiceName=service["Service"],
+                ServiceTags=service["Tags"],
+                ServiceAddress=service["Address"],
+                ServicePort=service["Port"],
+                ServiceMeta=service["Meta"],
+                ServiceWeights=service["Weights"],
+                ServiceEnableTagOverride=service["EnableTagOverride"],
+                CreateIndex=service["CreateIndex"],
+                ModifyIndex=service["ModifyIndex"],
+            )
+            entries.append(entry)
+        return self.table_index("services", "nodes"), entries
+
+    def health_service(self, name, tag=None, passing=False):
+        entries = []
+        for (node, service_id), service in sorted(self.services.items()):
+            if service["Service"] != name or (tag and tag not in service["Tags"]):
+                continue
+            checks = [
+                check
+                for (check_node, _), check in sorted(self.checks.items())
+                if check_node == node and check["ServiceID"] in ("", service_id)
+            ]
+            if passing and any(c["Status"] != PASSING for c in checks):
+                continue
+            entries.append(
+                {"Node": self.nodes[node], "Service": service, "Checks": checks}
+            )
+        return self.table_index("services", "nodes", "checks"), entries
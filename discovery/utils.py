@@ -1,21 +1,9 @@
-import collections
 import random
-import uuid
+from collections import OrderedDict
 
+RR_MAXSIZE = 1024
 
-class _InnerServices:
-    def __init__(self):
-        self.services = {}
-
-    def add(self, key, value):
-        if key not in self.services or len(self.services.get(key)) == 0:
-            self.services.update({key: collections.deque(value)})
-
-    def get(self, value):
-        return self.services.get(value).popleft()
-
-
-rr_services = _InnerServices()
+_rr_positions: OrderedDict = OrderedDict()
 
 
 def select_one_random(services):
@@ -24,6 +12,27 @@ def select_one_random(services):
 
 
 def select_one_rr(services):
-    key_ = uuid.uuid5(uuid.NAMESPACE_DNS, str(services)).hex
-    rr_services.add(key_, services)
-    return rr_services.get(key_)
+    """Round-robin over ``services``, rotating separately per membership.
+
+    This builds a key from every instance on each call; ``Consul.find_service``
+    uses a per-client :class:`~discovery.balancer.RoundRobin` that picks in O(1).
+    """
+    key = tuple(instance_id(service) for service in services)
+    position = _rr_positions.pop(key, 0)
+    _rr_positions[key] = position + 1
+    if len(_rr_positions) > RR_MAXSIZE:
+        _rr_positions.popitem(last=False)
+    return services[position % len(services)]
+
+
+def instance_id(instance) -> str:
+    """Stable identifier of a catalog or health service entry."""
+    if not isinstance(instance, dict):
+        return str(instance)
+    if "Service" in instance and isinstance(instance["Service"], dict):
+        node = instance.get("Node") or {}
+        service_id = instance["Service"].get("ID")
+        return f"{service_id}@{node.get('Node', '')}"
+    if "ServiceID" in instance:
+        return f"{instance['ServiceID']}@{instance.get('Node', '')}"
+    return str(instance.get("ID") or instance.get("id") or instance)
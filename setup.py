@@ -19,7 +19,7 @@ setuptools.setup(
     license="Apache-2.0",
     url="https://github.com/amenezes/discovery-client",
     packages=setuptools.find_packages(include=["discovery", "discovery.*"]),
-    python_requires=">=3.6.0",
+    python_requires=">=3.7.0",
     project_urls=OrderedDict((
         ('Documentation', 'https://discovery-client.amenezes.net'),
         ('Code', 'https://github.com/amenezes/discovery-client'),
@@ -30,15 +30,14 @@ setuptools.setup(
     ],
     extras_require={
         "aio": ["aiohttp<=3.6.2"],
-        "httpx": ["httpx>=0.12.0"],
+        "httpx": ["httpx>=0.18.0"],
         "cli": ["cleo"],
-        "all": ["aiohttp<=3.6.2", "httpx>=0.12.0", "cleo"],
+        "all": ["aiohttp<=3.6.2", "httpx>=0.18.0", "cleo"],
     },
     setup_requires=["setuptools>=38.6.0"],
     entry_points={"console_scripts": ["discovery=discovery.__main__:application.run [cli]"]},
     classifiers=[
         "Programming Language :: Python :: 3 :: Only",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Framework :: AsyncIO",
@@ -1,6 +1,11 @@
+import aiohttp
+import httpx
 import pytest
+from aiohttp import web
 
 from discovery import api
+from discovery.engine import AioEngine
+from discovery.exceptions import ClientOperationException
 
 
 def stream_logs_sample():
@@ -198,12 +203,104 @@ async def test_metrics(agent, expected):
     assert response == metrics_response()
 
 
-# @pytest.mark.skip
-# @pytest.mark.asyncio
-# @pytest.mark.parametrize("expected", [metrics_response()])
-# async def test_stream_logs(agent, expected):
-#     response = await agent.stream_logs(stream=True)
-#     assert response
+class LogStreamMock:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+        self.closed = False
+
+    async def iter_chunks(self, chunk_size):
+        for start in range(0, len(self.body), 7):
+            yield self.body[start : start + 7]
+
+    async def close(self):
+        self.closed = True
+
+
+class LogApiMock:
+    url = ""
+
+    def __init__(self, response):
+        self.response = response
+        self.kwargs = None
+
+    async def get(self, *args, **kwargs):
+        self.kwargs = kwargs
+        return self.response
+
+
+@pytest.fixture
+def log_stream():
+    return LogStreamMock("\n".join(stream_logs_sample()).encode())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_size", [0, 2])
+async def test_stream_logs(log_stream, queue_size):
+    client = LogApiMock(log_stream)
+    agent = api.Agent(client=client)
+    lines = [
+        line
+        async for line in agent.stream_logs(
+            loglevel="info", logjson=True, queue_size=queue_size
+        )
+    ]
+    assert lines == stream_logs_sample()
+    assert client.kwargs == {
+        "params": {"loglevel": "info", "logjson": "true"},
+        "stream": True,
+    }
+    assert log_stream.closed
+
+
+@pytest.mark.asyncio
+async def test_stream_logs_error_status():
+    log_stream = LogStreamMock(b"Permission denied", status=403)
+    agent = api.Agent(client=LogApiMock(log_stream))
+    with pytest.raises(ClientOperationException):
+        async for _ in agent.stream_logs():
+            pass
+    assert log_stream.closed
+
+
+@pytest.fixture
+async def monitor_server():
+    async def monitor(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        body = "\n".join(stream_logs_sample()).encode()
+        for start in range(0, len(body), 7):
+            await response.write(body[start : start + 7])
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/v1/agent/monitor", monitor)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield runner.addresses[0][1]
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", [aiohttp.ClientSession, httpx.AsyncClient])
+async def test_stream_logs_over_real_session(monitor_server, backend):
+    engine = AioEngine(backend(), host="127.0.0.1", port=monitor_server)
+    agent = api.Agent(client=engine)
+    lines = [line async for line in agent.stream_logs(loglevel="info")]
+    assert lines == stream_logs_sample()
+    await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_logs_early_close(log_stream):
+    agent = api.Agent(client=LogApiMock(log_stream))
+    logs = agent.stream_logs(queue_size=1)
+    assert await logs.__anext__() == stream_logs_sample()[0]
+    await logs.aclose()
+    assert log_stream.closed
 
 
 @pytest.mark.asyncio
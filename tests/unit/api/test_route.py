@@ -0,0 +1,82 @@
+import pytest
+from conftest import SessionMock
+
+from discovery import api
+from discovery.api.route import Route
+from discovery.engine import AioEngine
+from discovery.metrics import Instrumentation
+
+
+class RecordingEngine:
+    url = "http://localhost:8500"
+    instrumentation = None
+
+    def __init__(self):
+        self.calls = []
+
+    async def get(self, url, **kwargs):
+        self.calls.append(("GET", url, kwargs))
+
+    async def put(self, url, **kwargs):
+        self.calls.append(("PUT", url, kwargs))
+
+
+@pytest.fixture
+def engine():
+    return RecordingEngine()
+
+
+def test_route_is_compiled_once(engine):
+    health = api.Health(client=engine)
+    assert health.service is health.service
+    assert health.service.name == "health.service"
+    assert isinstance(api.Health.service, Route)
+
+
+@pytest.mark.asyncio
+async def test_route_url(engine):
+    kv = api.Kv(client=engine)
+    await kv.update("a/b", b"1")
+    await kv.read(key="a/b", params={"recurse": 1})
+    assert engine.calls == [
+        ("PUT", "http://localhost:8500/v1/kv/a/b", {"data": b"1"}),
+        ("GET", "http://localhost:8500/v1/kv/a/b", {"params": {"recurse": 1}}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_route_params(engine):
+    service = api.Service(client=engine)
+    await service.maintenance("web-1", True, reason="deploy & restart")
+    method, url, kwargs = engine.calls[0]
+    assert url == "http://localhost:8500/v1/agent/service/maintenance/web-1"
+    assert kwargs == {"params": {"enable": "true", "reason": "deploy & restart"}}
+
+
+@pytest.mark.asyncio
+async def test_route_named_data(engine):
+    checks = api.Checks(client=engine)
+    await checks.check_pass("web-ttl", notes="ok")
+    assert engine.calls[0][2] == {"data": "ok"}
+    with pytest.raises(TypeError):
+        await checks.deregister()
+
+
+@pytest.mark.asyncio
+async def test_route_name_in_metrics():
+    instrumentation = Instrumentation()
+    engine = AioEngine(SessionMock(), instrumentation=instrumentation)
+    kv = api.Kv(client=engine)
+    await kv.update("key", b"value")
+    await kv.create("key", b"value")
+    await engine.put(f"{kv.url}/key", data=b"value")
+    registry = instrumentation.registry
+    assert (
+        registry.counter("discovery_responses_total", route="kv.write", status="200")
+        == 3
+    )
+    await kv.read("key")
+    assert (
+        registry.counter("discovery_responses_total", route="kv.read", status="200")
+        == 1
+    )
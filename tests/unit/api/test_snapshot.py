@@ -1,6 +1,11 @@
+import aiohttp
+import httpx
 import pytest
+from aiohttp import web
 
 from discovery import api
+from discovery.engine import AioEngine
+from discovery.exceptions import ClientOperationException
 
 
 @pytest.fixture
@@ -25,3 +30,137 @@ async def test_restore(snapshot, expected):
     data = await snap.content()
     response = await snapshot.restore(data=data)
     assert response.status == 200
+
+
+class StreamResponseMock:
+    def __init__(self, chunks, status=200):
+        self.chunks = chunks
+        self.status = status
+        self.closed = False
+
+    async def iter_chunks(self, chunk_size):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+class StreamApiMock:
+    url = ""
+
+    def __init__(self, response):
+        self.response = response
+        self.kwargs = None
+
+    async def get(self, *args, **kwargs):
+        self.kwargs = kwargs
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_save_to(tmp_path):
+    response = StreamResponseMock([b"abc", b"def"])
+    client = StreamApiMock(response)
+    path = tmp_path / "backup.snap"
+    size = await api.Snapshot(client=client).save_to(str(path))
+    assert size == 6
+    assert path.read_bytes() == b"abcdef"
+    assert client.kwargs == {"stream": True}
+    assert response.closed
+
+
+@pytest.mark.asyncio
+async def test_save_to_failure(tmp_path):
+    response = StreamResponseMock([b"error"], status=500)
+    path = tmp_path / "backup.snap"
+    with pytest.raises(ClientOperationException):
+        await api.Snapshot(client=StreamApiMock(response)).save_to(str(path))
+    assert list(tmp_path.iterdir()) == []
+
+
+class RestoreApiMock:
+    url = ""
+
+    def __init__(self):
+        self.body = None
+        self.headers = None
+
+    async def put(self, *args, data=None, headers=None, **kwargs):
+        self.headers = headers
+        self.body = b"".join([bytes(chunk) async for chunk in data])
+        return ResponseMock(200)
+
+
+class ResponseMock:
+    def __init__(self, status):
+        self.status = status
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    path = tmp_path / "backup.snap"
+    path.write_bytes(b"x" * 10)
+    return str(path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_mmap", [False, True])
+async def test_restore_from(snapshot_file, use_mmap):
+    client = RestoreApiMock()
+    progress = []
+    response = await api.Snapshot(client=client).restore_from(
+        snapshot_file,
+        chunk_size=4,
+        progress=lambda sent, total: progress.append((sent, total)),
+        expected_size=10,
+        use_mmap=use_mmap,
+    )
+    assert response.status == 200
+    assert client.body == b"x" * 10
+    assert client.headers == {"Content-Length": "10"}
+    assert progress[-1] == (10, 10)
+
+
+@pytest.mark.asyncio
+async def test_restore_from_size_mismatch(snapshot_file):
+    with pytest.raises(ClientOperationException):
+        await api.Snapshot(client=RestoreApiMock()).restore_from(
+            snapshot_file, expected_size=11
+        )
+
+
+@pytest.fixture
+async def restore_server():
+    received = []
+
+    async def restore(request):
+        received.append(await request.read())
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_put("/v1/snapshot", restore)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield runner.addresses[0][1], received
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("backend", [aiohttp.ClientSession, httpx.AsyncClient])
+async def test_restore_from_over_real_session(
+    restore_server, backend, use_mmap, tmp_path
+):
+    port, received = restore_server
+    path = tmp_path / "backup.snap"
+    path.write_bytes(bytes(range(256)) * 1000)
+    engine = AioEngine(backend(), host="127.0.0.1", port=port)
+    response = await api.Snapshot(client=engine).restore_from(
+        str(path), chunk_size=4096, use_mmap=use_mmap
+    )
+    assert response.status == 200
+    assert received == [path.read_bytes()]
+    await engine.close()
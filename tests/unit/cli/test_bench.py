@@ -0,0 +1,47 @@
+import aiohttp
+import pytest
+
+from discovery.cli.commands.bench import LoadGenerator, parse_mix
+from discovery.client import Consul
+from discovery.engine import AioEngine
+from discovery.testing import FakeConsul
+
+
+def test_parse_mix():
+    assert parse_mix("catalog:3, health:1") == {"catalog": 0.75, "health": 0.25}
+    assert parse_mix("kv_read") == {"kv_read": 1.0}
+
+
+@pytest.mark.parametrize("mix", ["unknown:1", "catalog:0"])
+def test_parse_mix_invalid(mix):
+    with pytest.raises(ValueError):
+        parse_mix(mix)
+
+
+@pytest.mark.asyncio
+async def test_load_generator():
+    async with FakeConsul() as server:
+        server.state.register(
+            {
+                "Node": "node-1",
+                "Address": "10.1.0.1",
+                "Service": {"ID": "web-1", "Service": "web", "Port": 8080},
+            }
+        )
+        session = aiohttp.ClientSession()
+        generator = LoadGenerator(
+            Consul(AioEngine(session, host=server.host, port=server.port)),
+            parse_mix("catalog:1,health:1,kv_read:1,kv_write:1,register:1"),
+            concurrency=2,
+            service="web",
+        )
+        try:
+            results = await generator.run(0.2)
+        finally:
+            await session.close()
+    assert results["concurrency"] == 2
+    for name, operation in results["operations"].items():
+        assert operation["requests"] > 0, name
+        assert operation["errors"] == 0, name
+        assert operation["p99"] >= operation["p50"] > 0
+        assert operation["buckets"][-1] == ["+Inf", operation["requests"]]
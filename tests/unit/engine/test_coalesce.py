@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from conftest import SessionMock
+
+from discovery.engine import AioEngine
+from discovery.engine.coalesce import request_key
+
+BODY = b'[{"ServiceName": "myapp"}]'
+
+
+def test_request_key():
+    assert request_key("u", {"b": 1, "a": 2}) == request_key("u", {"a": 2, "b": 1})
+    assert request_key("u", headers={"X-Consul-Token": "a"}) != request_key(
+        "u", headers={"X-Consul-Token": "b"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_share_one_request():
+    session = SessionMock(body=BODY, delay=0.01)
+    engine = AioEngine(session, coalesce=True)
+    url = "http://localhost:8500/v1/catalog/service/myapp"
+    responses = await asyncio.gather(*[engine.get(url) for _ in range(20)])
+    assert len(session.calls) == 1
+    bodies = [await response.json() for response in responses]
+    assert bodies[0] == [{"ServiceName": "myapp"}]
+    bodies[0][0]["ServiceName"] = "changed"
+    assert bodies[1] == [{"ServiceName": "myapp"}]
+    assert await responses[0].text() == '[{"ServiceName": "myapp"}]'
+
+
+@pytest.mark.asyncio
+async def test_different_params_are_not_shared():
+    session = SessionMock(body=BODY, delay=0.01)
+    engine = AioEngine(session, coalesce=True)
+    url = "http://localhost:8500/v1/catalog/service/myapp"
+    await asyncio.gather(engine.get(url, params={"dc": "a"}), engine.get(url))
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalescing_is_opt_in():
+    session = SessionMock(body=BODY, delay=0.01)
+    engine = AioEngine(session)
+    url = "http://localhost:8500/v1/catalog/service/myapp"
+    await asyncio.gather(engine.get(url), engine.get(url))
+    assert len(session.calls) == 2
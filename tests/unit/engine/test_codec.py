@@ -0,0 +1,59 @@
+import pytest
+from conftest import HttpxResponseMock, RawResponseMock, SessionMock
+
+from discovery.engine import AioEngine
+from discovery.engine.codec import JsonCodec, get_codec
+from discovery.engine.response import HttpResponse
+
+
+@pytest.mark.parametrize("name", ["json", None])
+def test_codec_roundtrip(name):
+    codec = get_codec(name)
+    data = {"Name": "myapp", "Tags": ["a"], "Port": 5000}
+    assert codec.loads(codec.dumps(data)) == data
+    assert isinstance(codec.dumps(data), bytes)
+
+
+def test_unknown_codec():
+    with pytest.raises(ModuleNotFoundError):
+        get_codec("simplejson-x")
+
+
+@pytest.mark.asyncio
+async def test_response_body_is_read_once():
+    raw = RawResponseMock(body=b'{"a": 1}')
+    response = HttpResponse(raw)
+    assert await response.json() == {"a": 1}
+    assert await response.json() is await response.json()
+    assert await response.text() == '{"a": 1}'
+    assert await response.content() == b'{"a": 1}'
+    assert raw.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_httpx_response_decoding():
+    response = HttpResponse(HttpxResponseMock(body=b"[1, 2]"), JsonCodec())
+    assert await response.json() == [1, 2]
+    assert await response.text() == "[1, 2]"
+
+
+@pytest.mark.asyncio
+async def test_empty_body_json():
+    assert await HttpResponse(RawResponseMock(body=b"")).json() is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kwarg", ["data", "json"])
+async def test_engine_serializes_dicts(kwarg):
+    session = SessionMock()
+    engine = AioEngine(session, codec="json")
+    await engine.put("http://localhost:8500/v1/kv/key", **{kwarg: {"a": 1}})
+    assert session.calls == [{"data": b'{"a":1}'}]
+
+
+@pytest.mark.asyncio
+async def test_engine_keeps_serialized_data():
+    session = SessionMock()
+    engine = AioEngine(session)
+    await engine.put("http://localhost:8500/v1/kv/key", data="raw")
+    assert session.calls == [{"data": "raw"}]
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from conftest import RawResponseMock, SessionMock
+
+from discovery.api import Health
+from discovery.engine import AioEngine, RetryPolicy, Watch
+from discovery.engine.deadline import deadline, remaining
+from discovery.exceptions import DeadlineExceededException
+
+INDEX = {"X-Consul-Index": "6"}
+
+
+class StalledResponseMock(RawResponseMock):
+    async def read(self):
+        await asyncio.sleep(1)
+        return await super().read()
+
+
+def test_nested_deadline_only_shrinks():
+    assert remaining() is None
+    with deadline(10):
+        with deadline(100):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_engine_timeout():
+    engine = AioEngine(SessionMock(delay=1), timeout=0.01)
+    with pytest.raises(DeadlineExceededException):
+        await engine.get("http://localhost:8500/v1/agent/self")
+
+
+@pytest.mark.asyncio
+async def test_deadline_covers_body():
+    session = SessionMock(response=StalledResponseMock)
+    engine = AioEngine(session, timeout=0.01)
+    with pytest.raises(DeadlineExceededException):
+        await engine.get("http://localhost:8500/v1/catalog/services")
+    assert session.responses[0].released
+
+
+@pytest.mark.asyncio
+async def test_per_call_deadline():
+    session = SessionMock(delay=1)
+    engine = AioEngine(session)
+    with pytest.raises(DeadlineExceededException):
+        await engine.get("http://localhost:8500/v1/agent/self", deadline=0.01)
+    assert session.calls == [{}]
+
+
+@pytest.mark.asyncio
+async def test_deadline_inherited_by_nested_calls():
+    engine = AioEngine(SessionMock(delay=0.02))
+    with deadline(0.03):
+        await engine.get("http://localhost:8500/v1/agent/self")
+        with pytest.raises(DeadlineExceededException):
+            await engine.get("http://localhost:8500/v1/agent/self")
+
+
+@pytest.mark.asyncio
+async def test_retries_share_deadline():
+    session = SessionMock(status=503)
+    policy = RetryPolicy(attempts=10, backoff=1, max_backoff=1)
+    engine = AioEngine(session, retry_policy=policy)
+    with deadline(0.001):
+        response = await engine.get("http://localhost:8500/v1/agent/self")
+    assert response.status == 503
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_wait_derived_from_deadline():
+    session = SessionMock(headers=INDEX)
+    engine = AioEngine(session)
+    watch = Watch(engine.get, "http://localhost:8500/v1/kv/key", wait=300, jitter=0)
+    watch.index = 5
+    with deadline(10.1):
+        assert await watch.__anext__() is True
+    wait = int(session.calls[0]["params"]["wait"][:-2])
+    assert 9000 <= wait < 9500
+
+
+@pytest.mark.asyncio
+async def test_watch_wait_derived_from_engine_timeout():
+    session = SessionMock(headers=INDEX)
+    engine = AioEngine(session, timeout=1)
+    watch = Health(client=engine).watch_service("web", jitter=0)
+    watch.index = 5
+    await watch.__anext__()
+    wait = int(session.calls[0]["params"]["wait"][:-2])
+    assert 800 <= wait < 900
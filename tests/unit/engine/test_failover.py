@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from conftest import SessionMock
+
+from discovery import api
+from discovery.engine.failover import Endpoint, FailoverEngine
+
+
+def test_endpoint_parse():
+    endpoint = Endpoint.parse("https://10.0.0.1:8501")
+    assert (endpoint.scheme, endpoint.host, endpoint.port) == (
+        "https",
+        "10.0.0.1",
+        8501,
+    )
+    assert Endpoint.parse("consul").url == "http://consul:8500"
+
+
+def test_endpoints_from_env(monkeypatch):
+    monkeypatch.setenv("CONSUL_HOSTS", "a:8500, b:8500")
+    engine = FailoverEngine(SessionMock())
+    assert [e.netloc for e in engine.endpoints] == ["a:8500", "b:8500"]
+
+
+@pytest.mark.asyncio
+async def test_failover_to_healthy_endpoint():
+    session = SessionMock(down=["a:8500"])
+    engine = FailoverEngine(session, endpoints=["a:8500", "b:8500"])
+    health = api.Health(client=engine)
+    response = await health.service("myapp", params={"passing": 1})
+    assert response.url == "http://b:8500/v1/health/service/myapp"
+    assert session.urls[0].startswith("http://a:8500")
+    assert engine.endpoints[0].failures == 1
+
+
+@pytest.mark.asyncio
+async def test_ejection_and_probe():
+    session = SessionMock(down=["a:8500"])
+    engine = FailoverEngine(
+        session, endpoints=["a:8500", "b:8500"], max_failures=1, ejection_time=0
+    )
+    await engine.get(f"{engine.url}/v1/status/leader")
+    endpoint = engine.endpoints[0]
+    assert endpoint.ejections == 1
+    session.down.clear()
+    assert await engine.probe(endpoint)
+    assert endpoint.ejected_until == 0
+
+
+@pytest.mark.asyncio
+async def test_all_endpoints_down():
+    engine = FailoverEngine(SessionMock(down=["a", "b"]), endpoints=["a", "b"])
+    with pytest.raises(ConnectionRefusedError):
+        await engine.get(f"{engine.url}/v1/status/leader")
+
+
+@pytest.mark.asyncio
+async def test_no_failover_after_request_sent():
+    session = SessionMock(down=["a:8500"], error=ConnectionResetError)
+    engine = FailoverEngine(session, endpoints=["a", "b"])
+    with pytest.raises(ConnectionResetError):
+        await engine.put(f"{engine.url}/v1/session/create")
+    assert len(session.urls) == 1
+    response = await engine.get(f"{engine.url}/v1/status/leader")
+    assert response.url.startswith("http://b:8500")
+
+
+@pytest.mark.asyncio
+async def test_prefers_lowest_latency():
+    engine = FailoverEngine(SessionMock(), endpoints=["a", "b"])
+    a, b = engine.endpoints
+    a.success(0.5, engine.alpha)
+    b.success(0.01, engine.alpha)
+    assert engine.candidates()[0] is b
+
+
+@pytest.mark.asyncio
+async def test_refresh_from_peers():
+    session = SessionMock(
+        bodies={"/status/peers": json.dumps(["10.0.0.2:8300"]).encode()}
+    )
+    engine = FailoverEngine(session, endpoints=["a:8500"])
+    await engine.refresh()
+    assert [e.netloc for e in engine.endpoints] == ["a:8500", "10.0.0.2:8500"]
+
+
+@pytest.mark.asyncio
+async def test_failed_peer_refresh_is_logged(caplog):
+    engine = FailoverEngine(SessionMock(down=["a:8500"]), endpoints=["a:8500"])
+    await engine.refresh()
+    assert "refresh of consul peers failed" in caplog.text
@@ -0,0 +1,72 @@
+import pytest
+from conftest import SessionMock
+
+from discovery.engine import AioEngine, FailoverEngine, HedgingPolicy
+from discovery.engine.hedge import MIN_SAMPLES
+
+
+def policy(**kwargs):
+    hedging = HedgingPolicy(min_delay=0.01, max_delay=0.01, ratio=1, **kwargs)
+    hedging.budget._tokens = 10
+    return hedging
+
+
+def test_applies():
+    hedging = HedgingPolicy()
+    assert hedging.applies("GET", "http://a/v1/health/service/x")
+    assert hedging.applies("GET", "http://a/v1/kv/key")
+    assert not hedging.applies("PUT", "http://a/v1/kv/key")
+    assert not hedging.applies("GET", "http://a/v1/agent/self")
+    assert not hedging.applies(
+        "GET", "http://a/v1/kv/key", params={"index": 10, "wait": "1s"}
+    )
+
+
+def test_delay_follows_percentile():
+    hedging = HedgingPolicy(percentile=0.5, min_delay=0, max_delay=10)
+    for latency in [0.1] * 50 + [1.0] * 50:
+        hedging.record(latency)
+    assert hedging.delay == 0.1
+
+
+def test_delay_waits_for_enough_samples():
+    hedging = HedgingPolicy(min_delay=0, max_delay=1)
+    hedging.record(0.001)
+    for _ in range(MIN_SAMPLES - 2):
+        hedging.record(0.5)
+    assert hedging.delay == 1
+    hedging.record(0.5)
+    assert hedging.delay == 0.5
+
+
+def test_ratio_never_exceeds_one():
+    assert HedgingPolicy(ratio=5).budget.ratio == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_against_slow_endpoint():
+    session = SessionMock(delays={"a:8500": 1})
+    engine = FailoverEngine(session, endpoints=["a", "b"], hedging=policy())
+    response = await engine.get(f"{engine.url}/v1/catalog/service/myapp")
+    assert response.url.startswith("http://b:8500")
+    assert engine.hedging.hedged == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_response_is_not_hedged():
+    session = SessionMock()
+    engine = AioEngine(session, hedging=policy())
+    await engine.get(f"{engine.url}/v1/catalog/service/myapp")
+    assert len(session.urls) == 1
+    assert engine.hedging.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_capped():
+    session = SessionMock(delay=0.05)
+    hedging = HedgingPolicy(min_delay=0.01, max_delay=0.01, ratio=0.5)
+    engine = AioEngine(session, hedging=hedging)
+    for _ in range(4):
+        await engine.get(f"{engine.url}/v1/kv/key")
+    assert hedging.hedged == 2
+    assert len(session.urls) == 6
@@ -0,0 +1,66 @@
+import pytest
+from aiohttp import web
+
+from discovery import api
+from discovery.engine import AioEngine, FailoverEngine, pooled_engine
+
+
+@pytest.fixture
+@pytest.mark.asyncio
+async def consul_port(unused_tcp_port):
+    async def leader(request):
+        return web.json_response("127.0.0.1:8300")
+
+    app = web.Application()
+    app.router.add_get("/v1/status/leader", leader)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", unused_tcp_port)
+    await site.start()
+    yield unused_tcp_port
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["aiohttp", "httpx"])
+async def test_pooled_engine(consul_port, backend):
+    engine = await pooled_engine(
+        backend, pool_size=7, keepalive_timeout=5, host="127.0.0.1", port=consul_port
+    )
+    response = await api.Status(client=engine).leader()
+    assert await response.json() == "127.0.0.1:8300"
+    stats = engine.pool_stats()
+    assert stats["limit"] == 7
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+    await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_engine_class():
+    engine = await pooled_engine(engine_cls=FailoverEngine, endpoints=["a", "b"])
+    assert isinstance(engine, FailoverEngine)
+    assert engine.pool_stats()["in_use"] == 0
+    await engine.close()
+
+
+class ConnectorMock:
+    limit = 10
+    limit_per_host = 2
+
+
+class SessionMock:
+    connector = ConnectorMock()
+
+
+def test_pool_stats_without_private_attributes():
+    stats = AioEngine(SessionMock()).pool_stats()
+    assert stats == dict(limit=10, limit_per_host=2, in_use=None, idle=None)
+
+
+@pytest.mark.asyncio
+async def test_invalid_options():
+    with pytest.raises(ValueError):
+        await pooled_engine("requests")
+    with pytest.raises(ValueError):
+        await pooled_engine("aiohttp", http2=True)
@@ -0,0 +1,112 @@
+import aiohttp
+import httpx
+import pytest
+from conftest import HttpxResponseMock, RawResponseMock, SessionMock
+
+from discovery.engine import AioEngine
+from discovery.engine.retry import CircuitBreaker, RetryBudget, RetryPolicy
+from discovery.exceptions import CircuitBreakerOpenException
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def sleep(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr("discovery.engine.aio.asyncio.sleep", sleep)
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(backoff=1, max_backoff=2)
+    assert all(0 <= policy.delay(10) <= 2 for _ in range(100))
+
+
+def test_retryable():
+    policy = RetryPolicy()
+    assert policy.retryable("GET", error=ValueError())
+    assert not policy.retryable("POST", error=ValueError())
+    assert policy.retryable("POST", error=ConnectionRefusedError())
+    assert not policy.retryable("POST", error=ConnectionResetError())
+    assert not policy.retryable("PUT", error=aiohttp.ServerTimeoutError())
+    assert policy.retryable("PUT", error=httpx.ConnectTimeout("timeout"))
+    assert policy.retryable("GET", error=aiohttp.ServerTimeoutError())
+    assert not policy.retryable("GET", error=CircuitBreakerOpenException())
+    assert policy.retryable("GET", response=RawResponseMock(status=503))
+    assert not policy.retryable("GET", response=RawResponseMock(status=404))
+
+
+@pytest.mark.asyncio
+async def test_retry_on_status(no_sleep):
+    session = SessionMock([503, 503, 200])
+    engine = AioEngine(session, retry_policy=RetryPolicy(attempts=3))
+    response = await engine.get("http://localhost:8500/v1/status/leader")
+    assert response.status == 200
+    assert len(session.calls) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "response, closed",
+    [(RawResponseMock, "released"), (HttpxResponseMock, "closed")],
+)
+async def test_retried_response_is_closed(no_sleep, response, closed):
+    session = SessionMock([503], response=response)
+    engine = AioEngine(session, retry_policy=RetryPolicy(attempts=2))
+    await engine.get("http://localhost:8500/v1/status/leader")
+    first, second = session.responses
+    assert getattr(first, closed) and not getattr(second, closed)
+
+
+@pytest.mark.asyncio
+async def test_no_retry_for_non_idempotent(no_sleep):
+    session = SessionMock([503])
+    engine = AioEngine(session, retry_policy=RetryPolicy())
+    response = await engine.post("http://localhost:8500/v1/txn")
+    assert response.status == 503
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_exhausted(no_sleep):
+    session = SessionMock([500] * 10)
+    policy = RetryPolicy(attempts=5, budget=RetryBudget(ratio=0, min_tokens=1))
+    engine = AioEngine(session, retry_policy=policy)
+    response = await engine.get("http://localhost:8500/v1/status/leader")
+    assert response.status == 500
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens():
+    session = SessionMock([ConnectionRefusedError(), 500])
+    breaker = CircuitBreaker(threshold=2, reset_timeout=60)
+    engine = AioEngine(session, circuit_breaker=breaker)
+    url = "http://localhost:8500/v1/status/leader"
+    with pytest.raises(ConnectionRefusedError):
+        await engine.get(url)
+    await engine.get(url)
+    assert breaker.state("localhost:8500") == CircuitBreaker.OPEN
+    with pytest.raises(CircuitBreakerOpenException):
+        await engine.get(url)
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_open():
+    session = SessionMock([500, 200])
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+    engine = AioEngine(session, circuit_breaker=breaker)
+    url = "http://localhost:8500/v1/status/leader"
+    await engine.get(url)
+    assert breaker.state("localhost:8500") == CircuitBreaker.HALF_OPEN
+    await engine.get(url)
+    assert breaker.state("localhost:8500") == CircuitBreaker.CLOSED
@@ -0,0 +1,99 @@
+import aiohttp
+import httpx
+import pytest
+from aiohttp import web
+
+from discovery import api
+from discovery.engine import AioEngine
+from discovery.engine.response import HttpResponse
+
+SNAPSHOT = bytes(range(256)) * 1024
+
+
+class StreamReaderMock:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.body), size):
+            yield self.body[start : start + size]
+
+
+class AioStreamResponseMock:
+    def __init__(self, body):
+        self.content = StreamReaderMock(body)
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class HttpxStreamResponseMock:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def aiter_bytes(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_iter_chunks():
+    raw = AioStreamResponseMock(b"0123456789")
+    response = HttpResponse(raw)
+    chunks = [chunk async for chunk in response.iter_chunks(4)]
+    assert chunks == [b"0123", b"4567", b"89"]
+    await response.close()
+    assert raw.released
+
+
+@pytest.mark.asyncio
+async def test_httpx_iter_chunks():
+    raw = HttpxStreamResponseMock([b"ab", b"cd"])
+    response = HttpResponse(raw)
+    assert [chunk async for chunk in response.iter_chunks()] == [b"ab", b"cd"]
+    await response.close()
+    assert raw.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_chunks_after_read():
+    response = HttpResponse(None)
+    response._body = b"abcde"
+    assert [chunk async for chunk in response.iter_chunks(2)] == [b"ab", b"cd", b"e"]
+
+
+@pytest.fixture
+async def snapshot_server():
+    async def snapshot(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for start in range(0, len(SNAPSHOT), 10000):
+            await response.write(SNAPSHOT[start : start + 10000])
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/v1/snapshot", snapshot)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield runner.addresses[0][1]
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", [aiohttp.ClientSession, httpx.AsyncClient])
+async def test_save_to_over_real_session(snapshot_server, backend, tmp_path):
+    session = backend()
+    engine = AioEngine(session, host="127.0.0.1", port=snapshot_server)
+    path = tmp_path / "consul.snap"
+    size = await api.Snapshot(client=engine).save_to(str(path), chunk_size=4096)
+    assert size == len(SNAPSHOT)
+    assert path.read_bytes() == SNAPSHOT
+    await engine.close()
@@ -0,0 +1,57 @@
+import pytest
+from aiohttp import web
+
+from discovery import api
+from discovery.engine import AioEngine, aiohttp_session, httpx_client
+from discovery.engine.abc import unix_socket_path
+
+
+@pytest.fixture
+@pytest.mark.asyncio
+async def consul_socket(tmp_path):
+    async def leader(request):
+        return web.json_response("127.0.0.1:8300")
+
+    app = web.Application()
+    app.router.add_get("/v1/status/leader", leader)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    path = str(tmp_path / "consul.sock")
+    site = web.UnixSite(runner, path)
+    await site.start()
+    yield path
+    await runner.cleanup()
+
+
+def test_unix_socket_path(monkeypatch):
+    assert unix_socket_path("unix:///var/run/consul.sock") == "/var/run/consul.sock"
+    assert unix_socket_path("localhost") is None
+    monkeypatch.setenv("CONSUL_HOST", "unix:///tmp/consul.sock")
+    assert unix_socket_path() == "/tmp/consul.sock"
+
+
+def test_engine_url_with_unix_socket(monkeypatch):
+    monkeypatch.setenv("CONSUL_HOST", "unix:///tmp/consul.sock")
+    engine = AioEngine()
+    assert engine.uds == "/tmp/consul.sock"
+    assert engine.url == "http://localhost"
+    assert api.Status(client=engine).url == "http://localhost/v1/status"
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_over_unix_socket(consul_socket):
+    session = await aiohttp_session(uds=consul_socket)
+    engine = AioEngine(session, host=f"unix://{consul_socket}")
+    response = await api.Status(client=engine).leader()
+    assert await response.json() == "127.0.0.1:8300"
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_httpx_over_unix_socket(consul_socket, monkeypatch):
+    monkeypatch.setenv("CONSUL_HOST", f"unix://{consul_socket}")
+    client = await httpx_client()
+    engine = AioEngine(client)
+    response = await api.Status(client=engine).leader()
+    assert await response.json() == "127.0.0.1:8300"
+    await client.aclose()
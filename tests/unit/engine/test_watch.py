@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from discovery import api
+from discovery.engine.watch import Watch
+from discovery.exceptions import ClientOperationException
+
+
+class IndexedResponseMock:
+    def __init__(self, index, expected=None, status=200):
+        self.headers = {"X-Consul-Index": str(index)} if index is not None else {}
+        self.expected = expected
+        self.status = status
+        self.url = "http://localhost:8500/v1/health/service/myapp"
+
+    async def json(self):
+        return self.expected
+
+
+class BlockingApiMock:
+    def __init__(self, responses):
+        self.url = ""
+        self.responses = list(responses)
+        self.calls = []
+
+    async def get(self, *args, **kwargs):
+        self.calls.append(kwargs.get("params"))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def sleep(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr("discovery.engine.watch.asyncio.sleep", sleep)
+
+
+@pytest.mark.asyncio
+async def test_watch_blocks_on_last_index():
+    client = BlockingApiMock(
+        [
+            IndexedResponseMock(10, ["a"]),
+            IndexedResponseMock(10, ["a"]),
+            IndexedResponseMock(12, ["a", "b"]),
+        ]
+    )
+    health = api.Health(client=client)
+    watch = health.watch_service("myapp", wait=10, jitter=0)
+    assert await watch.__anext__() == ["a"]
+    assert await watch.__anext__() == ["a", "b"]
+    assert client.calls[0] == {}
+    assert client.calls[1] == {"index": 10, "wait": "10000ms"}
+    assert watch.index == 12
+
+
+@pytest.mark.asyncio
+async def test_watch_wait_jitter():
+    client = BlockingApiMock([IndexedResponseMock(1), IndexedResponseMock(2)])
+    watch = Watch(client.get, wait=10, jitter=0.5)
+    await watch.__anext__()
+    await watch.__anext__()
+    wait = int(client.calls[1]["wait"][:-2])
+    assert 5000 <= wait <= 10000
+
+
+@pytest.mark.asyncio
+async def test_watch_index_reset():
+    client = BlockingApiMock(
+        [IndexedResponseMock(50, "old"), IndexedResponseMock(3, "new")]
+    )
+    watch = Watch(client.get, jitter=0)
+    assert await watch.__anext__() == "old"
+    assert await watch.__anext__() == "new"
+    assert watch.index == 3
+
+
+@pytest.mark.asyncio
+async def test_watch_index_sanity():
+    client = BlockingApiMock([IndexedResponseMock(0, "data")])
+    watch = Watch(client.get)
+    assert await watch.__anext__() == "data"
+    assert watch.index == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_retries_on_failure(no_sleep):
+    client = BlockingApiMock(
+        [
+            ConnectionError(),
+            IndexedResponseMock(5, status=500),
+            IndexedResponseMock(5, "data"),
+        ]
+    )
+    watch = Watch(client.get)
+    assert await watch.__anext__() == "data"
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_watch_unsupported_endpoint():
+    client = BlockingApiMock([IndexedResponseMock(None)])
+    watch = Watch(client.get)
+    with pytest.raises(ClientOperationException):
+        await watch.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_watch_latest_drops_intermediate_values():
+    client = BlockingApiMock([IndexedResponseMock(i, i) for i in range(1, 4)])
+    pending = asyncio.Event()
+
+    async def get(*args, **kwargs):
+        if not client.responses:
+            pending.set()
+            await asyncio.sleep(3600)
+        return await client.get(*args, **kwargs)
+
+    async with Watch(get, latest=True) as watch:
+        assert await watch.__anext__() == 3
+        assert pending.is_set()
+    with pytest.raises(StopAsyncIteration):
+        await watch.__anext__()
@@ -0,0 +1,39 @@
+import gc
+import weakref
+
+from discovery import api
+from discovery.client import Consul
+from discovery.engine import AioEngine
+
+
+def test_apis_are_created_lazily():
+    client = Consul(AioEngine())
+    assert "catalog" not in vars(client)
+    assert isinstance(client.catalog, api.Catalog)
+    assert client.catalog is client.catalog
+
+
+def test_apis_are_shared_per_engine():
+    engine = AioEngine()
+    client, other = Consul(engine), Consul(engine)
+    assert client.kv is other.kv
+    assert client.agent.connect is client.connect
+    assert client.connect.intentions is client.agent.connect.intentions
+    assert Consul(AioEngine()).kv is not client.kv
+
+
+def test_injected_api_wins():
+    catalog = api.Catalog(client=AioEngine())
+    client = Consul(AioEngine(), catalog=catalog)
+    assert client.catalog is catalog
+    agent = api.Agent(client=client.client, service="custom")
+    assert agent.service == "custom"
+
+
+def test_shared_apis_do_not_leak_engines():
+    engine = AioEngine()
+    ref = weakref.ref(engine)
+    Consul(engine).agent.service
+    del engine
+    gc.collect()
+    assert ref() is None
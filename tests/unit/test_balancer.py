@@ -0,0 +1,344 @@
+import pytest
+
+from discovery.balancer import (
+    LatencyEWMA,
+    LeastOutstanding,
+    Maglev,
+    OutlierDetector,
+    PowerOfTwoChoices,
+    RendezvousSubset,
+    RoundRobin,
+    WeightedRoundRobin,
+    instance_weight,
+)
+from discovery.utils import instance_id
+
+
+def instances(*ids):
+    return [{"ServiceID": id_, "Node": "node"} for id_ in ids]
+
+
+def test_round_robin():
+    balancer = RoundRobin()
+    web = instances("a", "b", "c")
+    db = instances("x", "y")
+    picks = [balancer.pick("web", web)["ServiceID"] for _ in range(4)]
+    assert picks == ["a", "b", "c", "a"]
+    assert balancer.pick("db", db)["ServiceID"] == "x"
+    assert balancer.pick("web", web)["ServiceID"] == "b"
+
+
+def test_round_robin_membership_change():
+    balancer = RoundRobin()
+    balancer.pick("web", instances("a", "b", "c"))
+    assert balancer.pick("web", instances("a", "b", "c", "d"))["ServiceID"] == "b"
+    assert balancer.pick("web", instances("a", "c", "d"))["ServiceID"] == "c"
+    assert balancer.pick("web", instances("a", "c", "d"))["ServiceID"] == "d"
+
+
+def test_same_list_is_not_rescanned():
+    balancer = RoundRobin()
+    web = instances("a", "b")
+    balancer.pick("web", web)
+    state = balancer.members("web", web)
+    assert balancer.members("web", web) is state
+
+
+def test_eviction(monkeypatch):
+    balancer = RoundRobin(maxsize=2, ttl=10)
+    for name in ("a", "b", "c"):
+        balancer.pick(name, instances("1"))
+    assert "a" not in balancer and len(balancer) == 2
+
+    now = [0.0]
+    monkeypatch.setattr("discovery.balancer.time.monotonic", lambda: now[0])
+    balancer = RoundRobin(ttl=10)
+    balancer.pick("old", instances("1"))
+    now[0] = 20
+    balancer.pick("new", instances("1"))
+    assert "old" not in balancer
+
+
+def test_empty_instances():
+    with pytest.raises(ValueError):
+        RoundRobin().pick("web", [])
+
+
+def weighted(id_, passing=1, warning=1, status="passing"):
+    return {
+        "Node": {"Node": "node"},
+        "Service": {"ID": id_, "Weights": {"Passing": passing, "Warning": warning}},
+        "Checks": [{"Status": status}],
+    }
+
+
+def test_instance_weight():
+    assert instance_weight(weighted("a", passing=5)) == 5
+    assert instance_weight(weighted("a", passing=5, status="warning")) == 1
+    assert instance_weight({"ServiceWeights": {"Passing": 3}}) == 3
+    assert instance_weight({"ServiceID": "a"}) == 1
+
+
+def test_weighted_round_robin():
+    balancer = WeightedRoundRobin()
+    web = [weighted("a", passing=3), weighted("b", passing=1)]
+    picks = [balancer.pick("web", web)["Service"]["ID"] for _ in range(8)]
+    assert picks.count("a") == 6 and picks.count("b") == 2
+    assert picks[:4] == ["a", "a", "b", "a"]
+
+
+def test_weighted_round_robin_zero_weights():
+    balancer = WeightedRoundRobin()
+    web = [weighted("a", passing=0), weighted("b", passing=0)]
+    picks = {balancer.pick("web", web)["Service"]["ID"] for _ in range(4)}
+    assert picks == {"a", "b"}
+
+
+def test_report_tracks_outstanding():
+    balancer = LeastOutstanding()
+    web = instances("a", "b", "c")
+    picked = [balancer.pick("web", web) for _ in range(3)]
+    assert [i["ServiceID"] for i in picked] == ["a", "b", "c"]
+    balancer.report("web", picked[1], latency=0.1)
+    assert balancer.pick("web", web)["ServiceID"] == "b"
+    stats = balancer.stats("web", picked[1])
+    assert stats.outstanding == 1 and stats.requests == 1
+
+
+def test_stats_survive_membership_change():
+    balancer = LeastOutstanding()
+    a = balancer.pick("web", instances("a", "b"))
+    balancer.pick("web", instances("b", "a", "c"))
+    assert balancer.stats("web", a).outstanding == 1
+    assert balancer.pick("web", instances("b", "a", "c"))["ServiceID"] == "c"
+
+
+def test_power_of_two_choices():
+    balancer = PowerOfTwoChoices()
+    web = instances("a", "b")
+    first = balancer.pick("web", web)
+    second = balancer.pick("web", web)
+    assert first is not second
+
+
+def test_latency_ewma():
+    balancer = LatencyEWMA(alpha=0.5)
+    web = instances("slow", "fast")
+    for instance in web:
+        balancer.pick("web", [instance])
+    balancer.invalidate()
+    balancer.pick("web", web)
+    balancer.pick("web", web)
+    balancer.report("web", web[0], latency=1.0)
+    balancer.report("web", web[1], latency=0.01)
+    balancer.report("web", web[0], latency=0.0)
+    assert balancer.stats("web", web[0]).latency == 0.5
+    picks = [balancer.pick("web", web)["ServiceID"] for _ in range(5)]
+    assert picks == ["fast"] * 5
+
+
+def test_report_unknown_service():
+    RoundRobin().report("web", {"ServiceID": "a"}, latency=0.1)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("discovery.balancer.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_outlier_consecutive_errors(clock):
+    detector = OutlierDetector(consecutive_errors=2, max_ejection_percent=50)
+    balancer = RoundRobin(outlier=detector)
+    web = instances("a", "b", "c", "d")
+    balancer.pick("web", web)
+    balancer.report("web", web[0], error=True)
+    balancer.report("web", web[0], error=True)
+    assert balancer.stats("web", web[0]).ejected_until == 130
+    picks = [balancer.pick("web", web)["ServiceID"] for _ in range(6)]
+    assert "a" not in picks
+
+    clock[0] = 130
+    picks = [balancer.pick("web", web)["ServiceID"] for _ in range(4)]
+    assert "a" in picks
+    assert balancer.members("web", web).ejected == 0
+
+
+def test_outlier_backoff(clock):
+    detector = OutlierDetector(consecutive_errors=1, max_ejection_percent=50)
+    balancer = RoundRobin(outlier=detector)
+    web = instances("a", "b")
+    balancer.pick("web", web)
+    balancer.report("web", web[0], error=True)
+    clock[0] = 130
+    balancer.report("web", web[0], error=True)
+    assert balancer.stats("web", web[0]).ejected_until == 190
+    balancer.report("web", web[0], latency=0.1)
+    assert balancer.stats("web", web[0]).ejections == 2
+
+
+def test_outlier_latency_spike(clock):
+    detector = OutlierDetector(consecutive_slow=2, min_requests=4)
+    balancer = RoundRobin(outlier=detector)
+    web = instances("a", "b", "c")
+    balancer.pick("web", web)
+    for _ in range(4):
+        balancer.report("web", web[1], latency=0.01)
+    balancer.report("web", web[0], latency=1.0)
+    balancer.report("web", web[0], latency=0.01)
+    assert not balancer.stats("web", web[0]).ejected_until
+    balancer.report("web", web[0], latency=1.0)
+    balancer.report("web", web[0], latency=1.0)
+    assert balancer.stats("web", web[0]).ejected_until
+
+
+def test_outlier_max_ejection_percent(clock):
+    detector = OutlierDetector(consecutive_errors=1, max_ejection_percent=10)
+    balancer = RoundRobin(outlier=detector)
+    web = instances("a", "b", "c")
+    balancer.pick("web", web)
+    balancer.report("web", web[0], error=True)
+    balancer.report("web", web[1], error=True)
+    assert balancer.stats("web", web[0]).ejected_until
+    assert not balancer.stats("web", web[1]).ejected_until
+
+
+def test_outlier_ejection_disabled(clock):
+    detector = OutlierDetector(consecutive_errors=1, max_ejection_percent=0)
+    balancer = RoundRobin(outlier=detector)
+    web = instances("a", "b")
+    balancer.pick("web", web)
+    balancer.report("web", web[0], error=True)
+    assert not balancer.stats("web", web[0]).ejected_until
+
+
+@pytest.mark.parametrize("percent", [-1, 101])
+def test_outlier_max_ejection_percent_range(percent):
+    with pytest.raises(ValueError):
+        OutlierDetector(max_ejection_percent=percent)
+
+
+def test_outlier_all_ejected_falls_back(clock):
+    detector = OutlierDetector(consecutive_errors=1, max_ejection_percent=100)
+    balancer = RoundRobin(outlier=detector)
+    web = instances("a", "b")
+    balancer.pick("web", web)
+    balancer.report("web", web[0], error=True)
+    balancer.report("web", web[1], error=True)
+    assert balancer.pick("web", web)["ServiceID"] in ("a", "b")
+
+
+def test_outlier_survives_membership_change(clock):
+    detector = OutlierDetector(consecutive_errors=1, max_ejection_percent=50)
+    balancer = RoundRobin(outlier=detector)
+    balancer.pick("web", instances("a", "b"))
+    balancer.report("web", {"ServiceID": "a", "Node": "node"}, error=True)
+    web = instances("c", "a", "b")
+    assert balancer.members("web", web).ejected == 1
+    assert "a" not in {balancer.pick("web", web)["ServiceID"] for _ in range(6)}
+
+
+def test_maglev_sticky_keys():
+    balancer = Maglev(table_size=251)
+    web = instances(*"abcde")
+    picks = {key: balancer.pick("web", web, key)["ServiceID"] for key in range(200)}
+    assert set(picks.values()) == set("abcde")
+    assert all(
+        balancer.pick("web", web, key)["ServiceID"] == picks[key] for key in picks
+    )
+
+    other = Maglev(table_size=251)
+    reordered = instances(*"edcba")
+    assert all(
+        other.pick("web", reordered, key)["ServiceID"] == picks[key] for key in picks
+    )
+
+
+def test_maglev_minimal_disruption():
+    balancer = Maglev(table_size=1009)
+    web = instances(*"abcdefghij")
+    before = {key: balancer.pick("web", web, key)["ServiceID"] for key in range(1000)}
+    after = {
+        key: balancer.pick("web", web[:-1], key)["ServiceID"] for key in range(1000)
+    }
+    moved = [key for key in before if before[key] != after[key]]
+    removed = [key for key in before if before[key] == "j"]
+    assert "j" not in after.values()
+    assert len(moved) - len(removed) < len(before) * 0.05
+
+
+def test_maglev_reorder_reuses_table():
+    balancer = Maglev(table_size=101)
+    web = instances(*"abc")
+    state = balancer.members("web", web)
+    permutations = state.permutations
+    reordered = balancer.members("web", instances(*"cab"))
+    assert reordered.permutations == permutations
+    assert [reordered.ids[p] for p in reordered.table] == [
+        state.ids[p] for p in state.table
+    ]
+
+
+def test_maglev_skips_ejected(clock):
+    detector = OutlierDetector(consecutive_errors=1, max_ejection_percent=50)
+    balancer = Maglev(table_size=101, outlier=detector)
+    web = instances(*"abc")
+    keys = [k for k in range(50) if balancer.pick("web", web, k)["ServiceID"] == "a"]
+    balancer.report("web", web[0], error=True)
+    assert all(balancer.pick("web", web, k)["ServiceID"] != "a" for k in keys)
+
+
+def test_rendezvous_subset_is_stable():
+    web = instances(*(f"web-{n}" for n in range(50)))
+    subset = RendezvousSubset(5, client_id="client-1")
+    ids = [instance_id(i) for i in web]
+    chosen, chosen_ids = subset(web, ids)
+    assert len(chosen) == 5 and chosen_ids == [instance_id(i) for i in chosen]
+    reversed_ids = subset(web[::-1], ids[::-1])[1]
+    assert set(reversed_ids) == set(chosen_ids)
+    others = {
+        tuple(RendezvousSubset(5, client_id=f"client-{n}")(web, ids)[1])
+        for n in range(10)
+    }
+    assert len(others) > 1
+
+
+def test_rendezvous_subset_minimal_churn():
+    web = instances(*(f"web-{n}" for n in range(50)))
+    ids = [instance_id(i) for i in web]
+    subset = RendezvousSubset(5, client_id="client-1")
+    chosen_ids = subset(web, ids)[1]
+
+    kept = [p for p, id_ in enumerate(ids) if id_ != chosen_ids[0]]
+    after = subset([web[p] for p in kept], [ids[p] for p in kept])[1]
+    assert len(set(after) - set(chosen_ids)) == 1
+
+    spare = [p for p, id_ in enumerate(ids) if id_ not in chosen_ids][0]
+    kept = [p for p in range(len(ids)) if p != spare]
+    assert subset([web[p] for p in kept], [ids[p] for p in kept])[1] == chosen_ids
+
+
+def test_balancer_with_subset():
+    balancer = RoundRobin(subset=RendezvousSubset(3, client_id="client-1"))
+    web = instances(*(f"web-{n}" for n in range(20)))
+    picks = {balancer.pick("web", web)["ServiceID"] for _ in range(9)}
+    assert len(picks) == 3
+    state = balancer.members("web", web)
+    assert state.source is web and len(state.instances) == 3
+
+
+def test_rendezvous_subset_size():
+    with pytest.raises(ValueError):
+        RendezvousSubset(0)
+
+
+@pytest.mark.parametrize("table_size", [0, 1, 100])
+def test_maglev_table_size_must_be_prime(table_size):
+    with pytest.raises(ValueError):
+        Maglev(table_size=table_size)
+
+
+def test_maglev_populate_without_instances():
+    with pytest.raises(ValueError):
+        Maglev(table_size=101).populate([])
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from discovery.cache import ServiceCache
+from discovery.client import Consul
+
+
+class Loader:
+    def __init__(self, value=None):
+        self.value = ["instance"] if value is None else value
+        self.calls = 0
+
+    async def __call__(self, name):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.value
+
+
+class WatchMock:
+    def __init__(self, values):
+        self.values = list(values)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.values:
+            await asyncio.sleep(3600)
+        return self.values.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+def expire(cache, name, stale=False):
+    entry = cache._entries[name]
+    entry.expires = 0
+    if stale:
+        entry.stale_until = 0
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss():
+    cache, loader = ServiceCache(), Loader()
+    assert await cache.get("myapp", loader) == ["instance"]
+    assert await cache.get("myapp", loader) == ["instance"]
+    assert loader.calls == 1
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    cache, loader = ServiceCache(), Loader()
+    results = await asyncio.gather(*[cache.get("myapp", loader) for _ in range(50)])
+    assert loader.calls == 1
+    assert all(r == ["instance"] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate():
+    cache, loader = ServiceCache(), Loader()
+    await cache.get("myapp", loader)
+    expire(cache, "myapp")
+    loader.value = ["new-instance"]
+    assert await cache.get("myapp", loader) == ["instance"]
+    assert cache.stale_hits == 1
+    await asyncio.sleep(0.01)
+    assert await cache.get("myapp", loader) == ["new-instance"]
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_is_logged(caplog):
+    cache, loader = ServiceCache(), Loader()
+    await cache.get("myapp", loader)
+    expire(cache, "myapp")
+
+    async def failing(name):
+        raise ConnectionRefusedError("consul is down")
+
+    assert await cache.get("myapp", failing) == ["instance"]
+    await asyncio.wait([cache._inflight["myapp"]])
+    assert "refresh of myapp failed: consul is down" in caplog.text
+    assert "never retrieved" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_reloads():
+    cache, loader = ServiceCache(), Loader()
+    await cache.get("myapp", loader)
+    expire(cache, "myapp", stale=True)
+    await cache.get("myapp", loader)
+    assert loader.calls == 2
+    assert cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_negative_caching():
+    cache, loader = ServiceCache(negative_ttl=60), Loader([])
+    assert await cache.get("unknown", loader) == []
+    assert await cache.get("unknown", loader) == []
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache, loader = ServiceCache(maxsize=2), Loader()
+    await cache.get("a", loader)
+    await cache.get("b", loader)
+    await cache.get("a", loader)
+    await cache.get("c", loader)
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_refresh():
+    cache, loader = ServiceCache(watch=True), Loader()
+    watch = WatchMock([["instance"], ["watched"]])
+    assert await cache.get("myapp", loader, lambda name, **kw: watch) == ["instance"]
+    await asyncio.sleep(0.01)
+    assert await cache.get("myapp", loader) == ["watched"]
+    await cache.close()
+    await asyncio.sleep(0)
+    assert watch.closed
+
+
+@pytest.mark.asyncio
+async def test_consul_find_services_cached(consul_api):
+    consul_api.expected = ["instance"]
+    client = Consul(consul_api, cache=ServiceCache())
+    assert await client.find_services("myapp") == ["instance"]
+    assert await client.find_services("myapp") == ["instance"]
+    assert client.cache.hits == 1
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        ServiceCache(maxsize=0)
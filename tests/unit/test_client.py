@@ -1,8 +1,13 @@
+import json
+
 import pytest
+from conftest import SessionMock
 
+from discovery.balancer import LeastOutstanding, Maglev, RoundRobin
 from discovery.client import Consul
-from discovery.engine import aiohttp_session
+from discovery.engine import AioEngine, aiohttp_session
 from discovery.exceptions import ServiceNotFoundException
+from discovery.metrics import Instrumentation
 from discovery.model.agent import checks
 from discovery.utils import select_one_random
 
@@ -145,6 +150,32 @@ async def test_find_service_random(client, expected):
     assert response == SERVICE_RESPONSE
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expected", [SERVICES_RESPONSE])
+async def test_find_service_key(consul_api, expected):
+    consul_api.expected = expected
+    client = Consul(consul_api, balancer=Maglev(table_size=101))
+    response = await client.find_service("consul", key="user-1")
+    assert response == SERVICE_RESPONSE
+
+
+@pytest.mark.asyncio
+async def test_find_service_passing_only():
+    session = SessionMock(body=json.dumps(HEALTHY_INSTANCES_RESPONSE).encode())
+    balancer = Maglev(table_size=101)
+    client = Consul(AioEngine(session), balancer=balancer, passing=True)
+    response = await client.find_service("consul", key="user-1")
+    assert response in HEALTHY_INSTANCES_RESPONSE
+    assert session.urls == ["http://localhost:8500/v1/health/service/consul"]
+    assert session.calls == [{"params": {"passing": 1}}]
+
+
+@pytest.mark.parametrize("balancer", [Maglev(table_size=101), LeastOutstanding()])
+def test_balancer_from_constructor(consul_api, balancer):
+    assert Consul(consul_api, balancer=balancer).balancer is balancer
+    assert isinstance(Consul(consul_api).balancer, RoundRobin)
+
+
 @pytest.mark.asyncio
 async def test_service_not_found(client):
     with pytest.raises(ServiceNotFoundException):
@@ -220,3 +251,20 @@ async def test_deregister(client, expected):
     # async def test_deregister_additional_check_failed(client):
     #     with pytest.raises(TypeError):
     #         await self.dc.deregister_additional_check('invalid-check')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expected", [SERVICES_RESPONSE])
+async def test_find_service_records_pick(client, expected):
+    client.client.expected = expected
+    client.client.instrumentation = Instrumentation()
+    await client.find_service("consul")
+    registry = client.client.instrumentation.registry
+    assert (
+        registry.counter(
+            "discovery_balancer_picks_total",
+            service="consul",
+            instance="consul@6a4e48904f35",
+        )
+        == 1
+    )
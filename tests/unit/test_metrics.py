@@ -0,0 +1,119 @@
+import pytest
+from conftest import HttpxResponseMock, SessionMock
+
+from discovery.cache import ServiceCache
+from discovery.engine import AioEngine, RetryPolicy
+from discovery.metrics import (
+    Histogram,
+    Instrumentation,
+    LoggingSink,
+    MetricsRegistry,
+    route_name,
+)
+
+
+@pytest.mark.parametrize(
+    "method, url, expected",
+    [
+        ("GET", "http://localhost:8500/v1/health/service/myapp", "health.service"),
+        ("GET", "http://localhost:8500/v1/kv/a/b", "kv.read"),
+        ("PUT", "http://localhost:8500/v1/kv/a/b", "kv.write"),
+        ("GET", "http://localhost:8500/v1/status/leader", "status.leader"),
+        ("GET", "http://localhost:8500/", "unknown"),
+    ],
+)
+def test_route_name(method, url, expected):
+    assert route_name(method, url) == expected
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [(0.1, 1), (1, 3), (float("inf"), 4)]
+    assert histogram.quantile(0.5) == 1
+    assert histogram.count == 4
+
+
+def test_instrumentation_fans_out():
+    registry, other = MetricsRegistry(), MetricsRegistry()
+    instrumentation = Instrumentation(registry, other, LoggingSink())
+    instrumentation.inc("events_total", 2, {"kind": "a"})
+    assert registry.counter("events_total", kind="a") == 2
+    assert other.counter("events_total", kind="a") == 2
+    assert instrumentation.registry is registry
+
+
+@pytest.mark.asyncio
+async def test_engine_request_metrics():
+    instrumentation = Instrumentation()
+    engine = AioEngine(SessionMock(), instrumentation=instrumentation)
+    response = await engine.put("http://localhost:8500/v1/kv/key", data=b"value")
+    await response.content()
+    registry = instrumentation.registry
+    assert (
+        registry.counter("discovery_responses_total", route="kv.write", status="200")
+        == 1
+    )
+    assert registry.counter("discovery_request_bytes_total", route="kv.write") == 5
+    assert registry.counter("discovery_response_bytes_total", route="kv.write") == 4
+    assert registry.gauge("discovery_requests_in_flight", route="kv.write") == 0
+    histogram = registry.histogram(
+        "discovery_request_duration_seconds", route="kv.write", method="PUT"
+    )
+    assert histogram.count == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_bytes():
+    instrumentation = Instrumentation()
+    session = SessionMock(body=b"x" * 4096, response=HttpxResponseMock)
+    engine = AioEngine(session, instrumentation=instrumentation)
+    response = await engine.get("http://localhost:8500/v1/snapshot", stream=True)
+    assert [len(chunk) async for chunk in response.iter_chunks()] == [4096]
+    registry = instrumentation.registry
+    assert registry.counter("discovery_response_bytes_total", route="snapshot") == 4096
+
+
+@pytest.mark.asyncio
+async def test_engine_error_and_retry_metrics(monkeypatch):
+    async def sleep(*args):
+        pass
+
+    monkeypatch.setattr("discovery.engine.aio.asyncio.sleep", sleep)
+    instrumentation = Instrumentation()
+    engine = AioEngine(
+        SessionMock([503, 200]),
+        retry_policy=RetryPolicy(),
+        instrumentation=instrumentation,
+    )
+    await engine.get("http://localhost:8500/v1/catalog/services")
+    registry = instrumentation.registry
+    assert registry.counter("discovery_retries_total", route="catalog.services") == 1
+
+    engine = AioEngine(
+        SessionMock([ConnectionRefusedError()]), instrumentation=instrumentation
+    )
+    with pytest.raises(ConnectionRefusedError):
+        await engine.get("http://localhost:8500/v1/catalog/services")
+    assert (
+        registry.counter(
+            "discovery_responses_total", route="catalog.services", status="error"
+        )
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_metrics():
+    instrumentation = Instrumentation()
+    cache = ServiceCache(instrumentation=instrumentation)
+
+    async def loader(name):
+        return ["instance"]
+
+    await cache.get("myapp", loader)
+    await cache.get("myapp", loader)
+    registry = instrumentation.registry
+    assert registry.counter("discovery_cache_requests_total", result="hit") == 1
+    assert registry.counter("discovery_cache_requests_total", result="miss") == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from discovery.metrics import Instrumentation, MetricsRegistry
+from discovery.prometheus import CONTENT_TYPE, metrics_handler, render
+
+
+def test_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    registry.inc("discovery_retries_total", 2, {"route": "health.service"})
+    registry.set("discovery_requests_in_flight", 1, {"route": 'a"b'})
+    output = render(registry)
+    assert "# TYPE discovery_retries_total counter" in output
+    assert 'discovery_retries_total{route="health.service"} 2' in output
+    assert 'discovery_requests_in_flight{route="a\\"b"} 1' in output
+
+
+def test_render_histogram():
+    registry = MetricsRegistry(buckets=(0.1, 1))
+    registry.observe("discovery_watch_wait_seconds", 0.5, {"route": "kv.read"})
+    output = render(registry)
+    assert "# TYPE discovery_watch_wait_seconds histogram" in output
+    assert 'discovery_watch_wait_seconds_bucket{route="kv.read",le="0.1"} 0' in output
+    assert 'discovery_watch_wait_seconds_bucket{route="kv.read",le="+Inf"} 1' in output
+    assert 'discovery_watch_wait_seconds_sum{route="kv.read"} 0.5' in output
+    assert 'discovery_watch_wait_seconds_count{route="kv.read"} 1' in output
+
+
+def test_render_derived_gauges():
+    instrumentation = Instrumentation()
+    for result in ("hit", "hit", "stale", "miss"):
+        instrumentation.cache(result)
+    instrumentation.watch_contact("health.service", 42)
+    output = render(instrumentation.registry)
+    assert "discovery_cache_hit_ratio 0.75" in output
+    assert 'discovery_watch_index{route="health.service"} 42' in output
+    assert 'discovery_watch_lag_seconds{route="health.service"}' in output
+
+
+@pytest.mark.asyncio
+async def test_metrics_handler():
+    registry = MetricsRegistry()
+    registry.inc("discovery_retries_total")
+    response = await metrics_handler(registry)(None)
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    assert b"discovery_retries_total 1" in response.body
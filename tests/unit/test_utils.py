@@ -1,6 +1,6 @@
 import pytest
 
-from discovery.utils import select_one_random, select_one_rr
+from discovery.utils import instance_id, select_one_random, select_one_rr
 
 
 @pytest.fixture
@@ -29,3 +29,9 @@ def test_select_one_rr(services):
     assert select_one_rr(servicesB) == "d"
     assert select_one_rr(servicesC) == "h"
     assert select_one_rr(servicesC) == "f"
+
+
+def test_instance_id():
+    assert instance_id({"ServiceID": "web-1", "Node": "n1"}) == "web-1@n1"
+    health = {"Node": {"Node": "n2"}, "Service": {"ID": "web-2"}}
+    assert instance_id(health) == "web-2@n2"
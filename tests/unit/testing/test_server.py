@@ -0,0 +1,152 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from discovery import api
+from discovery.client import Consul
+from discovery.engine import AioEngine, Watch
+from discovery.testing import FakeConsul, parse_wait
+
+
+@pytest.fixture
+async def fake():
+    async with FakeConsul() as server:
+        yield server
+
+
+@pytest.fixture
+async def engine(fake):
+    session = aiohttp.ClientSession()
+    yield AioEngine(session, host=fake.host, port=fake.port)
+    await session.close()
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("10s", 10), ("100ms", 0.1), ("5m", 300), ("1h", 600)]
+)
+def test_parse_wait(value, expected):
+    assert parse_wait(value) == expected
+
+
+@pytest.mark.asyncio
+async def test_kv_roundtrip(engine):
+    kv = api.Kv(client=engine)
+    assert await (await kv.update("app/config", b"v1")).json() is True
+    response = await kv.read("app/config")
+    [entry] = await response.json()
+    assert entry["Value"] == "djE="
+    assert int(response.headers["X-Consul-Index"]) == entry["ModifyIndex"]
+    response = await kv.update("app/config", b"v2", params={"cas": 1})
+    assert await response.json() is False
+    assert (await kv.read("missing")).status == 404
+
+
+@pytest.mark.asyncio
+async def test_blocking_query_wakes_on_change(engine):
+    kv = api.Kv(client=engine)
+    await kv.update("key", b"a")
+    index = int((await kv.read("key")).headers["X-Consul-Index"])
+
+    async def write():
+        await asyncio.sleep(0.05)
+        await kv.update("other", b"x")
+        await kv.update("key", b"b")
+
+    writer = asyncio.ensure_future(write())
+    response = await kv.read("key", params={"index": index, "wait": "5s"})
+    await writer
+    [entry] = await response.json()
+    assert entry["Value"] == "Yg=="
+    assert int(response.headers["X-Consul-Index"]) > index + 1
+
+
+@pytest.mark.asyncio
+async def test_blocking_query_times_out(engine):
+    kv = api.Kv(client=engine)
+    await kv.update("key", b"a")
+    index = int((await kv.read("key")).headers["X-Consul-Index"])
+    response = await kv.read("key", params={"index": index, "wait": "50ms"})
+    assert int(response.headers["X-Consul-Index"]) == index
+
+
+@pytest.mark.asyncio
+async def test_watch_health_service(fake, engine):
+    health = api.Health(client=engine)
+    catalog = api.Catalog(client=engine)
+    async with Watch(health.service, "web", wait=1) as watch:
+        assert await watch.__anext__() == []
+        await catalog.register(
+            {"Node": "web-1", "Address": "10.1.0.1", "Service": {"Service": "web"}}
+        )
+        [entry] = await asyncio.wait_for(watch.__anext__(), 2)
+    assert entry["Node"]["Node"] == "web-1"
+
+
+@pytest.mark.asyncio
+async def test_health_passing_filter(fake, engine):
+    agent = api.Agent(client=engine)
+    health = api.Health(client=engine)
+    await agent.service.register(
+        {"Name": "web", "ID": "web-1", "Check": {"CheckID": "web-ttl", "TTL": "10s"}}
+    )
+    response = await health.service("web", params={"passing": 1})
+    assert await response.json() == []
+    await agent.checks.check_pass("web-ttl")
+    [entry] = await (await health.service("web", params={"passing": 1})).json()
+    assert entry["Service"]["ID"] == "web-1"
+
+
+@pytest.mark.asyncio
+async def test_txn(engine):
+    txn = api.Txn(client=engine)
+    response = await txn.create(
+        [
+            {"KV": {"Verb": "set", "Key": "a", "Value": "MQ=="}},
+            {"KV": {"Verb": "check-not-exists", "Key": "b"}},
+        ]
+    )
+    assert response.status == 200
+    response = await txn.create(
+        [
+            {"KV": {"Verb": "set", "Key": "b", "Value": "Mg=="}},
+            {"KV": {"Verb": "check-not-exists", "Key": "a"}},
+        ]
+    )
+    assert response.status == 409
+    assert (await response.json())["Errors"][0]["OpIndex"] == 1
+    assert (await api.Kv(client=engine).read("b")).status == 404
+
+
+@pytest.mark.asyncio
+async def test_session_lock(engine):
+    session = api.Session(client=engine)
+    kv = api.Kv(client=engine)
+    first = (await (await session.create({"Name": "a"})).json())["ID"]
+    second = (await (await session.create({"Name": "b"})).json())["ID"]
+    assert await (await kv.update("lock", b"", params={"acquire": first})).json()
+    assert not await (await kv.update("lock", b"", params={"acquire": second})).json()
+    await session.delete(first)
+    assert await (await kv.update("lock", b"", params={"acquire": second})).json()
+
+
+@pytest.mark.asyncio
+async def test_leader_change(fake, engine):
+    client = Consul(engine)
+    first = await client.leader_current_id()
+    fake.elect()
+    assert await client.leader_current_id() != first
+    fake.step_down()
+    response = await engine.get(f"{engine.url}/v1/catalog/services")
+    assert response.status == 500
+    assert await client.status.leader() is not None
+
+
+@pytest.mark.asyncio
+async def test_latency():
+    async with FakeConsul(latency=0.05) as server:
+        async with aiohttp.ClientSession() as session:
+            start = asyncio.get_event_loop().time()
+            async with session.get(f"{server.url}/v1/status/leader") as response:
+                assert await response.json() == "10.0.0.1:8300"
+            assert asyncio.get_event_loop().time() - start >= 0.05